@@ -170,6 +170,9 @@ FIELD_MAPPING = {
     'like_count': '点赞数',
 }
 
+# 发布时间字段的标准格式，解析时优先按此格式匹配
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 # 数据验证规则
 VALIDATION_RULES = {
     'required_fields': ['用户ID'],
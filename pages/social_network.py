@@ -3,10 +3,12 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import networkx as nx
 import sys
 from pathlib import Path
+from typing import Callable, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -24,6 +26,18 @@ st.set_page_config(
     layout="wide"
 )
 
+# 本页图表共用的Plotly模板，各图表的update_layout只需设置标题和坐标轴名称
+pio.templates['social_net'] = go.layout.Template(
+    layout=go.Layout(
+        font=dict(size=12)
+    )
+)
+SOCIAL_NET_TEMPLATE = 'plotly+social_net'
+
+# 互动强度分级中计入"高互动"和"有互动"的等级，报告的洞察与健康度评分共用
+_HIGH_INTERACTION_KEYS = ('高互动', '超高互动')
+_INTERACTIVE_KEYS = ('中等互动', '高互动', '超高互动')
+
 class SocialNetworkAnalyzer:
     """社交网络分析器"""
     
@@ -348,13 +362,11 @@ class SocialNetworkAnalyzer:
         analysis = {}
         
         # 检查文本字段
-        text_columns = [col for col in df.columns if '内容' in col]
-        if not text_columns:
+        text_column = _find_text_column(tuple(df.columns))
+        if text_column is None:
             analysis['error'] = "没有找到内容字段"
             return analysis
         
-        text_column = text_columns[0]
-        
         # 提取互动元素
         import re
         
@@ -446,6 +458,58 @@ class SocialNetworkAnalyzer:
         
         return analysis
 
+@cache_data(show_spinner=False)
+def _find_text_column(columns: tuple) -> Optional[str]:
+    """按列名元组查找第一个内容字段，同一数据结构只扫描一次"""
+    return next((col for col in columns if '内容' in col), None)
+
+def _kv(d: dict) -> tuple:
+    """一次性拆分字典的键和值，供同一组柱状图/饼图复用"""
+    return list(d), list(d.values())
+
+def _bar_pie_figure(labels: list, values: list, color: str, titles: tuple,
+                    axis_titles: tuple, text: list = None, tickangle: int = None) -> go.Figure:
+    """将同一分布的柱状图和饼图合并为一个左右子图，整体只序列化一次；tickangle为柱状图x轴标签的旋转角度"""
+    fig = make_subplots(
+        rows=1, cols=2,
+        specs=[[{'type': 'bar'}, {'type': 'pie'}]],
+        subplot_titles=titles
+    )
+    fig.add_trace(
+        go.Bar(
+            x=labels,
+            y=values,
+            marker_color=color,
+            text=values if text is None else text,
+            textposition='auto',
+            showlegend=False
+        ),
+        row=1, col=1
+    )
+    fig.add_trace(go.Pie(labels=labels, values=values, hole=0.3), row=1, col=2)
+    fig.update_xaxes(title_text=axis_titles[0], row=1, col=1)
+    if tickangle is not None:
+        fig.update_xaxes(tickangle=tickangle, row=1, col=1)
+    fig.update_yaxes(title_text=axis_titles[1], row=1, col=1)
+    fig.update_layout(template=SOCIAL_NET_TEMPLATE)
+    return fig
+
+def _render_cached(chart_id: str, fingerprint, build_fn: Callable[[], go.Figure]) -> None:
+    """按数据指纹复用上次构建的图表，数据未变化时跳过Plotly图表重建"""
+    fp_key = f"_chart_{chart_id}_fp"
+    fig_key = f"_chart_{chart_id}_fig"
+    if fig_key not in st.session_state or st.session_state.get(fp_key) != fingerprint:
+        st.session_state[fig_key] = build_fn()
+        st.session_state[fp_key] = fingerprint
+    st.plotly_chart(st.session_state[fig_key], use_container_width=True)
+
+def _metrics_row(items: list):
+    """按(标签, 数值)列表在同一行内并排显示指标卡片"""
+    if not items:
+        return
+    for col, (label, value) in zip(st.columns(len(items)), items):
+        col.metric(label, value)
+
 def main():
     """主函数"""
     st.title("🌐 社交网络分析")
@@ -492,6 +556,7 @@ def main():
 
 def show_user_interaction_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer):
     """显示用户互动分析"""
+    palette = analyzer.visualizer.color_palette
     st.subheader("👥 用户互动分析")
     
     # 分析用户互动
@@ -507,89 +572,43 @@ def show_user_interaction_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnal
         
         stats = interaction_analysis['basic_stats']
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("用户总数", stats['unique_users'])
-        with col2:
-            st.metric("内容总数", stats['total_posts'])
-        with col3:
-            st.metric("人均发布", f"{stats['avg_posts_per_user']:.1f}条")
+        _metrics_row([
+            ("用户总数", stats['unique_users']),
+            ("内容总数", stats['total_posts']),
+            ("人均发布", f"{stats['avg_posts_per_user']:.1f}条")
+        ])
     
     # 活跃度分布
     if 'activity_distribution' in interaction_analysis:
         st.subheader("📈 用户活跃度分布")
         
         activity_dist = interaction_analysis['activity_distribution']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 活跃度柱状图
-            fig_activity = go.Figure(data=[
-                go.Bar(
-                    x=list(activity_dist.keys()),
-                    y=list(activity_dist.values()),
-                    marker_color=analyzer.visualizer.color_palette[0],
-                    text=list(activity_dist.values()),
-                    textposition='auto'
-                )
-            ])
-            fig_activity.update_layout(
-                title="用户活跃度分布",
-                xaxis_title="活跃度等级",
-                yaxis_title="用户数量"
-            )
-            st.plotly_chart(fig_activity, use_container_width=True)
-        
-        with col2:
-            # 活跃度饼图
-            fig_activity_pie = go.Figure(data=[
-                go.Pie(
-                    labels=list(activity_dist.keys()),
-                    values=list(activity_dist.values()),
-                    hole=0.3
-                )
-            ])
-            fig_activity_pie.update_layout(title="活跃度占比")
-            st.plotly_chart(fig_activity_pie, use_container_width=True)
+        labels, counts = _kv(activity_dist)
+        
+        # 活跃度柱状图+饼图
+        fig_activity = _bar_pie_figure(
+            labels, counts,
+            color=palette[0],
+            titles=("用户活跃度分布", "活跃度占比"),
+            axis_titles=("活跃度等级", "用户数量")
+        )
+        st.plotly_chart(fig_activity, use_container_width=True)
     
     # 影响力分布
     if 'influence_distribution' in interaction_analysis:
         st.subheader("⭐ 用户影响力分布")
         
         influence_dist = interaction_analysis['influence_distribution']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 影响力柱状图
-            fig_influence = go.Figure(data=[
-                go.Bar(
-                    x=list(influence_dist.keys()),
-                    y=list(influence_dist.values()),
-                    marker_color=analyzer.visualizer.color_palette[1],
-                    text=list(influence_dist.values()),
-                    textposition='auto'
-                )
-            ])
-            fig_influence.update_layout(
-                title="用户影响力分布",
-                xaxis_title="影响力等级",
-                yaxis_title="用户数量"
-            )
-            st.plotly_chart(fig_influence, use_container_width=True)
-        
-        with col2:
-            # 影响力饼图
-            fig_influence_pie = go.Figure(data=[
-                go.Pie(
-                    labels=list(influence_dist.keys()),
-                    values=list(influence_dist.values()),
-                    hole=0.3
-                )
-            ])
-            fig_influence_pie.update_layout(title="影响力占比")
-            st.plotly_chart(fig_influence_pie, use_container_width=True)
+        labels, counts = _kv(influence_dist)
+        
+        # 影响力柱状图+饼图
+        fig_influence = _bar_pie_figure(
+            labels, counts,
+            color=palette[1],
+            titles=("用户影响力分布", "影响力占比"),
+            axis_titles=("影响力等级", "用户数量")
+        )
+        st.plotly_chart(fig_influence, use_container_width=True)
     
     # 用户活动详情
     if 'user_activity' in interaction_analysis:
@@ -627,6 +646,7 @@ def show_user_interaction_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnal
 
 def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer):
     """显示@提及网络分析"""
+    palette = analyzer.visualizer.color_palette
     st.subheader("🔗 @提及网络分析")
     
     # 选择文本列
@@ -651,13 +671,11 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
     # 基础统计
     st.subheader("📊 @提及统计")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("总提及次数", mention_analysis['mentions_count'])
-    with col2:
-        st.metric("提及者数量", mention_analysis['unique_mentioners'])
-    with col3:
-        st.metric("被提及者数量", mention_analysis['unique_mentioned'])
+    _metrics_row([
+        ("总提及次数", mention_analysis['mentions_count']),
+        ("提及者数量", mention_analysis['unique_mentioners']),
+        ("被提及者数量", mention_analysis['unique_mentioned'])
+    ])
     
     # 网络统计
     if 'network_stats' in mention_analysis:
@@ -665,16 +683,13 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
         
         network_stats = mention_analysis['network_stats']
         
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("网络节点", network_stats['nodes'])
-        with col2:
-            st.metric("网络边", network_stats['edges'])
-        with col3:
-            st.metric("网络密度", f"{network_stats['density']:.4f}")
-        with col4:
-            connected_status = "是" if network_stats.get('is_connected', False) else "否"
-            st.metric("弱连通", connected_status)
+        connected_status = "是" if network_stats.get('is_connected', False) else "否"
+        _metrics_row([
+            ("网络节点", network_stats['nodes']),
+            ("网络边", network_stats['edges']),
+            ("网络密度", f"{network_stats['density']:.4f}"),
+            ("弱连通", connected_status)
+        ])
     
     # 最常被提及的用户
     if 'most_mentioned' in mention_analysis:
@@ -694,12 +709,13 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
                     x=counts,
                     y=users,
                     orientation='h',
-                    marker_color=analyzer.visualizer.color_palette[0],
+                    marker_color=palette[0],
                     text=counts,
                     textposition='auto'
                 )
             ])
             fig_mentioned.update_layout(
+                template=SOCIAL_NET_TEMPLATE,
                 title="最常被提及用户(前10)",
                 xaxis_title="被提及次数",
                 yaxis_title="用户",
@@ -734,12 +750,13 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
                     x=counts,
                     y=mentioners,
                     orientation='h',
-                    marker_color=analyzer.visualizer.color_palette[1],
+                    marker_color=palette[1],
                     text=counts,
                     textposition='auto'
                 )
             ])
             fig_mentioners.update_layout(
+                template=SOCIAL_NET_TEMPLATE,
                 title="最活跃提及者(前10)",
                 xaxis_title="提及次数",
                 yaxis_title="用户",
@@ -810,7 +827,7 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
             mode='markers+text',
             marker=dict(
                 size=viz_data['node_size'],
-                color=analyzer.visualizer.color_palette[0],
+                color=palette[0],
                 line=dict(width=2, color='white')
             ),
             text=[text.split('<br>')[0] for text in viz_data['node_text']],  # 只显示用户名
@@ -821,6 +838,7 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
         ))
         
         fig_network.update_layout(
+            template=SOCIAL_NET_TEMPLATE,
             title="@提及网络图",
             showlegend=False,
             hovermode='closest',
@@ -857,6 +875,7 @@ def show_mention_network_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnaly
 
 def show_follower_pattern_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer):
     """显示关注者模式分析"""
+    palette = analyzer.visualizer.color_palette
     st.subheader("👥 关注者模式分析")
     
     # 分析关注者模式
@@ -872,124 +891,81 @@ def show_follower_pattern_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnal
         
         stats = follower_analysis['basic_stats']
         
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("分析用户数", stats['total_users'])
-        with col2:
-            st.metric("平均关注数", f"{stats['avg_following']:.0f}")
-        with col3:
-            st.metric("平均粉丝数", f"{stats['avg_followers']:.0f}")
-        with col4:
-            correlation = follower_analysis.get('following_followers_correlation', 0)
-            st.metric("关注粉丝相关性", f"{correlation:.3f}")
+        correlation = follower_analysis.get('following_followers_correlation', 0)
+        _metrics_row([
+            ("分析用户数", stats['total_users']),
+            ("平均关注数", f"{stats['avg_following']:.0f}"),
+            ("平均粉丝数", f"{stats['avg_followers']:.0f}"),
+            ("关注粉丝相关性", f"{correlation:.3f}")
+        ])
         
         # 最大值统计
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("最大关注数", f"{stats['max_following']:,}")
-        with col2:
-            st.metric("最大粉丝数", f"{stats['max_followers']:,}")
+        _metrics_row([
+            ("最大关注数", f"{stats['max_following']:,}"),
+            ("最大粉丝数", f"{stats['max_followers']:,}")
+        ])
     
     # 用户类型分布
     if 'user_type_distribution' in follower_analysis:
         st.subheader("👤 用户类型分布")
         
         user_types = follower_analysis['user_type_distribution']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 用户类型柱状图
-            fig_types = go.Figure(data=[
-                go.Bar(
-                    x=list(user_types.keys()),
-                    y=list(user_types.values()),
-                    marker_color=analyzer.visualizer.color_palette[0],
-                    text=list(user_types.values()),
-                    textposition='auto'
-                )
-            ])
-            fig_types.update_layout(
-                title="用户类型分布",
-                xaxis_title="用户类型",
-                yaxis_title="用户数量",
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig_types, use_container_width=True)
-        
-        with col2:
-            # 用户类型饼图
-            fig_types_pie = go.Figure(data=[
-                go.Pie(
-                    labels=list(user_types.keys()),
-                    values=list(user_types.values()),
-                    hole=0.3
-                )
-            ])
-            fig_types_pie.update_layout(title="用户类型占比")
-            st.plotly_chart(fig_types_pie, use_container_width=True)
+        labels, counts = _kv(user_types)
+        
+        # 用户类型柱状图+饼图
+        fig_types = _bar_pie_figure(
+            labels, counts,
+            color=palette[0],
+            titles=("用户类型分布", "用户类型占比"),
+            axis_titles=("用户类型", "用户数量"),
+            tickangle=-45
+        )
+        st.plotly_chart(fig_types, use_container_width=True)
     
     # 关注粉丝比分布
     if 'ratio_distribution' in follower_analysis:
         st.subheader("⚖️ 关注粉丝比分布")
         
         ratio_dist = follower_analysis['ratio_distribution']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 比例分布柱状图
-            fig_ratio = go.Figure(data=[
-                go.Bar(
-                    x=list(ratio_dist.keys()),
-                    y=list(ratio_dist.values()),
-                    marker_color=analyzer.visualizer.color_palette[1],
-                    text=list(ratio_dist.values()),
-                    textposition='auto'
-                )
-            ])
-            fig_ratio.update_layout(
-                title="关注粉丝比分布",
-                xaxis_title="比例类型",
-                yaxis_title="用户数量",
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig_ratio, use_container_width=True)
-        
-        with col2:
-            # 比例分布饼图
-            fig_ratio_pie = go.Figure(data=[
-                go.Pie(
-                    labels=list(ratio_dist.keys()),
-                    values=list(ratio_dist.values()),
-                    hole=0.3
-                )
-            ])
-            fig_ratio_pie.update_layout(title="关注粉丝比占比")
-            st.plotly_chart(fig_ratio_pie, use_container_width=True)
+        labels, counts = _kv(ratio_dist)
+        
+        # 比例分布柱状图+饼图
+        fig_ratio = _bar_pie_figure(
+            labels, counts,
+            color=palette[1],
+            titles=("关注粉丝比分布", "关注粉丝比占比"),
+            axis_titles=("比例类型", "用户数量"),
+            tickangle=-45
+        )
+        st.plotly_chart(fig_ratio, use_container_width=True)
     
     # 影响力分布
     if 'influence_distribution' in follower_analysis:
         st.subheader("⭐ 影响力分布")
         
         influence_dist = follower_analysis['influence_distribution']
+        labels, counts = _kv(influence_dist)
         
         # 影响力金字塔图
-        fig_influence = go.Figure(data=[
-            go.Bar(
-                x=list(influence_dist.keys()),
-                y=list(influence_dist.values()),
-                marker_color=analyzer.visualizer.color_palette[2],
-                text=list(influence_dist.values()),
-                textposition='auto'
+        def build_influence_figure():
+            fig = go.Figure(data=[
+                go.Bar(
+                    x=labels,
+                    y=counts,
+                    marker_color=palette[2],
+                    text=counts,
+                    textposition='auto'
+                )
+            ])
+            fig.update_layout(
+                template=SOCIAL_NET_TEMPLATE,
+                title="用户影响力分布",
+                xaxis_title="影响力等级",
+                yaxis_title="用户数量"
             )
-        ])
-        fig_influence.update_layout(
-            title="用户影响力分布",
-            xaxis_title="影响力等级",
-            yaxis_title="用户数量"
-        )
-        st.plotly_chart(fig_influence, use_container_width=True)
+            return fig
+        
+        _render_cached('sn_follower_influence', tuple(influence_dist.items()), build_influence_figure)
         
         # 影响力洞察
         total_users = sum(influence_dist.values())
@@ -1012,19 +988,18 @@ def show_follower_pattern_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnal
         
         outliers = follower_analysis['outliers']
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("异常用户总数", outliers['count'])
-        with col2:
-            st.metric("高关注用户", outliers['high_following'])
-        with col3:
-            st.metric("高粉丝用户", outliers['high_followers'])
+        _metrics_row([
+            ("异常用户总数", outliers['count']),
+            ("高关注用户", outliers['high_following']),
+            ("高粉丝用户", outliers['high_followers'])
+        ])
         
         if outliers['count'] > 0:
             st.info(f"🔍 发现{outliers['count']}个异常用户，可能是机器人账号或特殊用户")
 
 def show_interaction_intensity_analysis(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer):
     """显示互动强度分析"""
+    palette = analyzer.visualizer.color_palette
     st.subheader("🔥 互动强度分析")
     
     # 分析互动强度
@@ -1040,15 +1015,12 @@ def show_interaction_intensity_analysis(df: pd.DataFrame, analyzer: SocialNetwor
         
         stats = intensity_analysis['basic_stats']
         
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("总内容数", stats['total_posts'])
-        with col2:
-            st.metric("平均@提及", f"{stats['avg_mentions']:.2f}")
-        with col3:
-            st.metric("平均话题标签", f"{stats['avg_hashtags']:.2f}")
-        with col4:
-            st.metric("平均链接", f"{stats['avg_urls']:.2f}")
+        _metrics_row([
+            ("总内容数", stats['total_posts']),
+            ("平均@提及", f"{stats['avg_mentions']:.2f}"),
+            ("平均话题标签", f"{stats['avg_hashtags']:.2f}"),
+            ("平均链接", f"{stats['avg_urls']:.2f}")
+        ])
         
         st.metric("平均互动得分", f"{stats['avg_interaction_score']:.2f}")
     
@@ -1057,38 +1029,19 @@ def show_interaction_intensity_analysis(df: pd.DataFrame, analyzer: SocialNetwor
         st.subheader("📈 互动强度分布")
         
         intensity_dist = intensity_analysis['intensity_distribution']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 强度分布柱状图
-            fig_intensity = go.Figure(data=[
-                go.Bar(
-                    x=list(intensity_dist.keys()),
-                    y=list(intensity_dist.values()),
-                    marker_color=analyzer.visualizer.color_palette[0],
-                    text=list(intensity_dist.values()),
-                    textposition='auto'
-                )
-            ])
-            fig_intensity.update_layout(
-                title="互动强度分布",
-                xaxis_title="互动强度",
-                yaxis_title="内容数量"
+        labels, counts = _kv(intensity_dist)
+        
+        # 强度分布柱状图+饼图
+        _render_cached(
+            'sn_intensity_distribution',
+            tuple(intensity_dist.items()),
+            lambda: _bar_pie_figure(
+                labels, counts,
+                color=palette[0],
+                titles=("互动强度分布", "互动强度占比"),
+                axis_titles=("互动强度", "内容数量")
             )
-            st.plotly_chart(fig_intensity, use_container_width=True)
-        
-        with col2:
-            # 强度分布饼图
-            fig_intensity_pie = go.Figure(data=[
-                go.Pie(
-                    labels=list(intensity_dist.keys()),
-                    values=list(intensity_dist.values()),
-                    hole=0.3
-                )
-            ])
-            fig_intensity_pie.update_layout(title="互动强度占比")
-            st.plotly_chart(fig_intensity_pie, use_container_width=True)
+        )
     
     # 最活跃互动用户
     if 'top_interactive_users' in intensity_analysis:
@@ -1123,12 +1076,13 @@ def show_interaction_intensity_analysis(df: pd.DataFrame, analyzer: SocialNetwor
                         x=[user['interaction_score'] for user in top_10],
                         y=[user['user_name'] for user in top_10],
                         orientation='h',
-                        marker_color=analyzer.visualizer.color_palette[1],
+                        marker_color=palette[1],
                         text=[user['interaction_score'] for user in top_10],
                         textposition='auto'
                     )
                 ])
                 fig_top_users.update_layout(
+                    template=SOCIAL_NET_TEMPLATE,
                     title="最活跃互动用户(前10)",
                     xaxis_title="互动得分",
                     yaxis_title="用户",
@@ -1142,41 +1096,19 @@ def show_interaction_intensity_analysis(df: pd.DataFrame, analyzer: SocialNetwor
         
         preferences = intensity_analysis['interaction_preferences']
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 偏好柱状图
-            pref_labels = {'mentions': '@提及', 'hashtags': '话题标签', 'urls': '链接分享'}
-            labels = [pref_labels.get(k, k) for k in preferences.keys()]
-            values = list(preferences.values())
-            
-            fig_pref = go.Figure(data=[
-                go.Bar(
-                    x=labels,
-                    y=values,
-                    marker_color=analyzer.visualizer.color_palette[2],
-                    text=[f"{v:.1f}%" for v in values],
-                    textposition='auto'
-                )
-            ])
-            fig_pref.update_layout(
-                title="互动类型偏好",
-                xaxis_title="互动类型",
-                yaxis_title="占比(%)"
-            )
-            st.plotly_chart(fig_pref, use_container_width=True)
-        
-        with col2:
-            # 偏好饼图
-            fig_pref_pie = go.Figure(data=[
-                go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.3
-                )
-            ])
-            fig_pref_pie.update_layout(title="互动类型分布")
-            st.plotly_chart(fig_pref_pie, use_container_width=True)
+        # 偏好柱状图+饼图
+        pref_labels = {'mentions': '@提及', 'hashtags': '话题标签', 'urls': '链接分享'}
+        pref_keys, values = _kv(preferences)
+        labels = [pref_labels.get(k, k) for k in pref_keys]
+        
+        fig_pref = _bar_pie_figure(
+            labels, values,
+            color=palette[2],
+            titles=("互动类型偏好", "互动类型分布"),
+            axis_titles=("互动类型", "占比(%)"),
+            text=[f"{v:.1f}%" for v in values]
+        )
+        st.plotly_chart(fig_pref, use_container_width=True)
     
     # 互动与文本长度关系
     if 'length_interaction_correlation' in intensity_analysis:
@@ -1220,35 +1152,49 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     intensity_analysis = analyzer.analyze_interaction_intensity(df)
     
     # 检查文本字段用于@提及分析
-    text_columns = [col for col in df.columns if '内容' in col]
-    mention_analysis = {}
-    if text_columns:
-        mention_analysis = analyzer.analyze_mention_network(df, text_columns[0])
+    text_column = _find_text_column(tuple(df.columns))
+    mention_analysis = analyzer.analyze_mention_network(df, text_column) if text_column else {}
     
     # 关键指标概览
     st.subheader("📊 关键指标概览")
     
-    col1, col2, col3, col4 = st.columns(4)
+    key_metrics = []
     
-    with col1:
-        if 'basic_stats' in interaction_analysis:
-            unique_users = interaction_analysis['basic_stats']['unique_users']
-            st.metric("活跃用户数", unique_users)
+    if 'basic_stats' in interaction_analysis:
+        unique_users = interaction_analysis['basic_stats']['unique_users']
+        key_metrics.append(("活跃用户数", unique_users))
     
-    with col2:
-        if 'basic_stats' in follower_analysis:
-            avg_followers = follower_analysis['basic_stats']['avg_followers']
-            st.metric("平均粉丝数", f"{avg_followers:.0f}")
+    if 'basic_stats' in follower_analysis:
+        avg_followers = follower_analysis['basic_stats']['avg_followers']
+        key_metrics.append(("平均粉丝数", f"{avg_followers:.0f}"))
     
-    with col3:
-        if mention_analysis and 'mentions_count' in mention_analysis:
-            mentions_count = mention_analysis['mentions_count']
-            st.metric("@提及总数", mentions_count)
+    if mention_analysis and 'mentions_count' in mention_analysis:
+        mentions_count = mention_analysis['mentions_count']
+        key_metrics.append(("@提及总数", mentions_count))
+    
+    if 'basic_stats' in intensity_analysis:
+        avg_score = intensity_analysis['basic_stats']['avg_interaction_score']
+        key_metrics.append(("平均互动得分", f"{avg_score:.2f}"))
+    
+    _metrics_row(key_metrics)
+    
+    # 各分布的计数只读取一次，供特征总结、健康度评估和优化建议复用
+    activity_dist = interaction_analysis.get('activity_distribution', {})
+    activity_total = sum(activity_dist.values())
+    super_active = activity_dist.get('超级活跃', 0)
+    high_active = activity_dist.get('高度活跃', 0)
+    low_active = activity_dist.get('低度活跃', 0)
     
-    with col4:
-        if 'basic_stats' in intensity_analysis:
-            avg_score = intensity_analysis['basic_stats']['avg_interaction_score']
-            st.metric("平均互动得分", f"{avg_score:.2f}")
+    influence_dist = follower_analysis.get('influence_distribution', {})
+    influence_total = sum(influence_dist.values())
+    super_influencers = influence_dist.get('超级影响者', 0)
+    high_influencers = influence_dist.get('高影响者', 0)
+    
+    intensity_dist = intensity_analysis.get('intensity_distribution', {})
+    intensity_total = sum(intensity_dist.values())
+    no_interaction = intensity_dist.get('无互动', 0)
+    high_interaction = sum(intensity_dist.get(k, 0) for k in _HIGH_INTERACTION_KEYS)
+    interactive_count = sum(intensity_dist.get(k, 0) for k in _INTERACTIVE_KEYS)
     
     # 社交网络特征总结
     st.subheader("🌐 社交网络特征")
@@ -1256,46 +1202,36 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     network_insights = []
     
     # 用户活跃度特征
-    if 'activity_distribution' in interaction_analysis:
-        activity_dist = interaction_analysis['activity_distribution']
-        total_users = sum(activity_dist.values())
-        
-        if total_users > 0:
-            super_active = activity_dist.get('超级活跃', 0) / total_users * 100
-            if super_active > 20:
-                network_insights.append(f"🔥 高活跃度网络：{super_active:.1f}%的用户为超级活跃用户")
-            elif super_active > 10:
-                network_insights.append(f"📊 中等活跃度网络：{super_active:.1f}%的用户为超级活跃用户")
-            else:
-                network_insights.append(f"😴 低活跃度网络：仅{super_active:.1f}%的用户为超级活跃用户")
+    if activity_total > 0:
+        super_active_ratio = super_active / activity_total * 100
+        super_active_text = f"{super_active_ratio:.1f}"
+        if super_active_ratio > 20:
+            network_insights.append(f"🔥 高活跃度网络：{super_active_text}%的用户为超级活跃用户")
+        elif super_active_ratio > 10:
+            network_insights.append(f"📊 中等活跃度网络：{super_active_text}%的用户为超级活跃用户")
+        else:
+            network_insights.append(f"😴 低活跃度网络：仅{super_active_text}%的用户为超级活跃用户")
     
     # 影响力分布特征
-    if 'influence_distribution' in follower_analysis:
-        influence_dist = follower_analysis['influence_distribution']
-        total_users = sum(influence_dist.values())
-        
-        if total_users > 0:
-            kol_ratio = influence_dist.get('超级影响者', 0) / total_users * 100
-            if kol_ratio > 5:
-                network_insights.append(f"👑 KOL密集型网络：{kol_ratio:.1f}%的用户具有超级影响力")
-            else:
-                network_insights.append(f"👥 平民化网络：仅{kol_ratio:.1f}%的用户具有超级影响力")
+    if influence_total > 0:
+        kol_ratio = super_influencers / influence_total * 100
+        kol_ratio_text = f"{kol_ratio:.1f}"
+        if kol_ratio > 5:
+            network_insights.append(f"👑 KOL密集型网络：{kol_ratio_text}%的用户具有超级影响力")
+        else:
+            network_insights.append(f"👥 平民化网络：仅{kol_ratio_text}%的用户具有超级影响力")
     
     # 互动模式特征
-    if 'intensity_distribution' in intensity_analysis:
-        intensity_dist = intensity_analysis['intensity_distribution']
-        total_posts = sum(intensity_dist.values())
-        
-        if total_posts > 0:
-            high_interaction = intensity_dist.get('高互动', 0) + intensity_dist.get('超高互动', 0)
-            high_ratio = high_interaction / total_posts * 100
-            
-            if high_ratio > 30:
-                network_insights.append(f"🔥 高互动网络：{high_ratio:.1f}%的内容具有高互动性")
-            elif high_ratio > 15:
-                network_insights.append(f"📊 中等互动网络：{high_ratio:.1f}%的内容具有高互动性")
-            else:
-                network_insights.append(f"😐 低互动网络：仅{high_ratio:.1f}%的内容具有高互动性")
+    if intensity_total > 0:
+        high_ratio = high_interaction / intensity_total * 100
+        high_ratio_text = f"{high_ratio:.1f}"
+        
+        if high_ratio > 30:
+            network_insights.append(f"🔥 高互动网络：{high_ratio_text}%的内容具有高互动性")
+        elif high_ratio > 15:
+            network_insights.append(f"📊 中等互动网络：{high_ratio_text}%的内容具有高互动性")
+        else:
+            network_insights.append(f"😐 低互动网络：仅{high_ratio_text}%的内容具有高互动性")
     
     # 网络连通性特征
     if mention_analysis and 'network_stats' in mention_analysis:
@@ -1321,49 +1257,35 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     health_factors = []
     
     # 活跃度评分
-    if 'activity_distribution' in interaction_analysis:
-        activity_dist = interaction_analysis['activity_distribution']
-        total_users = sum(activity_dist.values())
-        
-        if total_users > 0:
-            active_ratio = (activity_dist.get('高度活跃', 0) + activity_dist.get('超级活跃', 0)) / total_users
-            activity_score = min(active_ratio * 100, 25)  # 最高25分
-            health_score += activity_score
-            health_factors.append(f"用户活跃度：{activity_score:.1f}/25")
+    if activity_total > 0:
+        active_ratio = (high_active + super_active) / activity_total
+        activity_score = min(active_ratio * 100, 25)  # 最高25分
+        health_score += activity_score
+        health_factors.append(f"用户活跃度：{activity_score:.1f}/25")
     
     # 影响力分布评分
-    if 'influence_distribution' in follower_analysis:
-        influence_dist = follower_analysis['influence_distribution']
-        total_users = sum(influence_dist.values())
+    if influence_total > 0:
+        # 理想的影响力分布应该是金字塔型
+        kol_ratio = super_influencers / influence_total
+        high_ratio = high_influencers / influence_total
+        
+        # 评分逻辑：KOL不能太多也不能太少，高影响者应该适中
+        if 0.01 <= kol_ratio <= 0.05 and 0.05 <= high_ratio <= 0.15:
+            influence_score = 25
+        elif 0.005 <= kol_ratio <= 0.1 and 0.03 <= high_ratio <= 0.2:
+            influence_score = 20
+        else:
+            influence_score = 15
         
-        if total_users > 0:
-            # 理想的影响力分布应该是金字塔型
-            kol_ratio = influence_dist.get('超级影响者', 0) / total_users
-            high_ratio = influence_dist.get('高影响者', 0) / total_users
-            
-            # 评分逻辑：KOL不能太多也不能太少，高影响者应该适中
-            if 0.01 <= kol_ratio <= 0.05 and 0.05 <= high_ratio <= 0.15:
-                influence_score = 25
-            elif 0.005 <= kol_ratio <= 0.1 and 0.03 <= high_ratio <= 0.2:
-                influence_score = 20
-            else:
-                influence_score = 15
-            
-            health_score += influence_score
-            health_factors.append(f"影响力分布：{influence_score}/25")
+        health_score += influence_score
+        health_factors.append(f"影响力分布：{influence_score}/25")
     
     # 互动活跃度评分
-    if 'intensity_distribution' in intensity_analysis:
-        intensity_dist = intensity_analysis['intensity_distribution']
-        total_posts = sum(intensity_dist.values())
-        
-        if total_posts > 0:
-            interactive_ratio = (intensity_dist.get('中等互动', 0) + 
-                               intensity_dist.get('高互动', 0) + 
-                               intensity_dist.get('超高互动', 0)) / total_posts
-            interaction_score = min(interactive_ratio * 50, 25)  # 最高25分
-            health_score += interaction_score
-            health_factors.append(f"互动活跃度：{interaction_score:.1f}/25")
+    if intensity_total > 0:
+        interactive_ratio = interactive_count / intensity_total
+        interaction_score = min(interactive_ratio * 50, 25)  # 最高25分
+        health_score += interaction_score
+        health_factors.append(f"互动活跃度：{interaction_score:.1f}/25")
     
     # 网络连通性评分
     if mention_analysis and 'network_stats' in mention_analysis:
@@ -1388,29 +1310,32 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     
     with col1:
         # 健康度仪表盘
-        fig_health = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = health_score,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "网络健康度"},
-            delta = {'reference': 80},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 50], 'color': "lightgray"},
-                    {'range': [50, 80], 'color': "yellow"},
-                    {'range': [80, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
+        def build_health_figure():
+            fig = go.Figure(go.Indicator(
+                mode = "gauge+number+delta",
+                value = health_score,
+                domain = {'x': [0, 1], 'y': [0, 1]},
+                title = {'text': "网络健康度"},
+                delta = {'reference': 80},
+                gauge = {
+                    'axis': {'range': [None, 100]},
+                    'bar': {'color': "darkblue"},
+                    'steps': [
+                        {'range': [0, 50], 'color': "lightgray"},
+                        {'range': [50, 80], 'color': "yellow"},
+                        {'range': [80, 100], 'color': "green"}
+                    ],
+                    'threshold': {
+                        'line': {'color': "red", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 90
+                    }
                 }
-            }
-        ))
-        fig_health.update_layout(height=300)
-        st.plotly_chart(fig_health, use_container_width=True)
+            ))
+            fig.update_layout(template=SOCIAL_NET_TEMPLATE, height=300)
+            return fig
+        
+        _render_cached('sn_health_gauge', health_score, build_health_figure)
     
     with col2:
         # 健康度因子详情
@@ -1438,36 +1363,20 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     suggestions = []
     
     # 基于活跃度的建议
-    if 'activity_distribution' in interaction_analysis:
-        activity_dist = interaction_analysis['activity_distribution']
-        total_users = sum(activity_dist.values())
-        
-        if total_users > 0:
-            low_active = activity_dist.get('低度活跃', 0) / total_users
-            if low_active > 0.5:
-                suggestions.append("📈 提升用户活跃度：考虑推出激励机制，鼓励用户更多参与")
+    if activity_total > 0 and low_active / activity_total > 0.5:
+        suggestions.append("📈 提升用户活跃度：考虑推出激励机制，鼓励用户更多参与")
     
     # 基于影响力的建议
-    if 'influence_distribution' in follower_analysis:
-        influence_dist = follower_analysis['influence_distribution']
-        total_users = sum(influence_dist.values())
-        
-        if total_users > 0:
-            kol_ratio = influence_dist.get('超级影响者', 0) / total_users
-            if kol_ratio < 0.01:
-                suggestions.append("👑 培养意见领袖：识别和培养潜在的KOL用户")
-            elif kol_ratio > 0.1:
-                suggestions.append("⚖️ 平衡影响力：避免过度依赖少数KOL用户")
+    if influence_total > 0:
+        kol_ratio = super_influencers / influence_total
+        if kol_ratio < 0.01:
+            suggestions.append("👑 培养意见领袖：识别和培养潜在的KOL用户")
+        elif kol_ratio > 0.1:
+            suggestions.append("⚖️ 平衡影响力：避免过度依赖少数KOL用户")
     
     # 基于互动的建议
-    if 'intensity_distribution' in intensity_analysis:
-        intensity_dist = intensity_analysis['intensity_distribution']
-        total_posts = sum(intensity_dist.values())
-        
-        if total_posts > 0:
-            no_interaction = intensity_dist.get('无互动', 0) / total_posts
-            if no_interaction > 0.6:
-                suggestions.append("💬 促进用户互动：优化内容推荐算法，增加互动功能")
+    if intensity_total > 0 and no_interaction / intensity_total > 0.6:
+        suggestions.append("💬 促进用户互动：优化内容推荐算法，增加互动功能")
     
     # 基于网络连通性的建议
     if mention_analysis and 'network_stats' in mention_analysis:
@@ -1533,12 +1442,10 @@ def show_social_network_report(df: pd.DataFrame, analyzer: SocialNetworkAnalyzer
     
     with col3:
         if st.button("导出健康度评估"):
-            health_data = {
-                '评估项目': health_factors,
-                '总体健康度': [f"{health_score:.1f}/100"] + [''] * (len(health_factors) - 1)
-            }
-            
-            health_df = pd.DataFrame(health_data)
+            health_df = pd.DataFrame({'评估项目': health_factors})
+            health_df['总体健康度'] = ''
+            if not health_df.empty:
+                health_df.iloc[0, 1] = f"{health_score:.1f}/100"
             csv = health_df.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="下载健康度报告",
@@ -9,12 +9,17 @@ from datetime import datetime, timedelta
 import sys
 from pathlib import Path
 
+try:
+    import polars as pl
+except ImportError:  # Polars为可选依赖，未安装时全部使用pandas计算
+    pl = None
+
 # 添加项目路径
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.visualizer import UserBehaviorVisualizer, create_dashboard_metrics, display_metrics_cards
 from utils.cache_manager import cache_data
-from config.settings import get_config
+from config.settings import get_config, TIME_FORMAT
 
 # 页面配置
 st.set_page_config(
@@ -23,14 +28,117 @@ st.set_page_config(
     layout="wide"
 )
 
+# 预处理后时间数据包含的特征列
+TIME_FEATURE_COLUMNS = ['hour', 'day_of_week', 'month', 'date', 'is_weekend']
+
+# day_of_week取值0-6对应的星期名称
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def _parse_publish_time(series: pd.Series) -> pd.Series:
+    """按标准格式解析发布时间，格式完全不匹配时再回退到自动推断"""
+    publish_time = pd.to_datetime(series, format=TIME_FORMAT, errors='coerce', cache=True)
+    if publish_time.isna().all() and series.notna().any():
+        publish_time = pd.to_datetime(series, errors='coerce', cache=True)
+    return publish_time
+
+def _extract_time_features_polars(df: pd.DataFrame):
+    """用Polars LazyFrame一次完成时间解析、过滤和特征提取，格式不匹配时返回None"""
+    lf = pl.from_pandas(df, include_index=False).lazy()
+    
+    publish_dtype = lf.collect_schema()['发布时间']
+    if publish_dtype == pl.String:
+        publish_time = pl.col('发布时间').str.to_datetime(format=TIME_FORMAT, strict=False)
+    elif isinstance(publish_dtype, pl.Datetime):
+        # 已是时间类型时保持原样，避免转换丢失时区而按UTC取小时和日期
+        publish_time = pl.col('发布时间')
+    else:
+        publish_time = pl.col('发布时间').cast(pl.Datetime)
+    
+    time_lf = (
+        lf.with_columns(publish_time)
+        .drop_nulls('发布时间')
+        .with_columns([
+            pl.col('发布时间').dt.hour().alias('hour'),
+            (pl.col('发布时间').dt.weekday() - 1).alias('day_of_week'),  # 0=Monday
+            pl.col('发布时间').dt.month().alias('month'),
+        ])
+    )
+    time_df = time_lf.collect()
+    if time_df.height == 0 and df['发布时间'].notna().any():
+        # 没有任何一行符合标准格式，交给pandas路径做格式推断
+        return None
+    return time_df.to_pandas()
+
+def _extract_time_features_pandas(df: pd.DataFrame) -> pd.DataFrame:
+    """pandas版本的时间解析和特征提取"""
+    publish_time = _parse_publish_time(df['发布时间'])
+    valid_mask = publish_time.notna()
+    
+    time_df = pd.DataFrame({'发布时间': publish_time[valid_mask]})
+    if '用户ID' in df.columns:
+        time_df['用户ID'] = df.loc[valid_mask, '用户ID']
+    
+    # 小时和星期直接由自纪元以来的整数秒算出，一次遍历且不经过.dt访问器
+    wall_time = time_df['发布时间']
+    if wall_time.dt.tz is not None:
+        wall_time = wall_time.dt.tz_localize(None)
+    seconds = wall_time.to_numpy(dtype='datetime64[s]').view(np.int64)
+    time_df['hour'] = (seconds // 3600) % 24
+    time_df['day_of_week'] = (seconds // 86400 + 3) % 7  # 0=Monday，1970-01-01为周四
+    time_df['month'] = time_df['发布时间'].dt.month
+    
+    return time_df
+
+@cache_data(ttl=1800, by_identity=True)
+def prepare_time_df(df: pd.DataFrame) -> pd.DataFrame:
+    """解析一次发布时间并预计算时间特征，供各分析方法和图表共用"""
+    columns = [col for col in ['发布时间', '用户ID'] if col in df.columns]
+    
+    time_df = None
+    if pl is not None:
+        try:
+            time_df = _extract_time_features_polars(df[columns])
+        except Exception:
+            # Polars无法处理的列类型（如混合类型对象列）回退到pandas
+            time_df = None
+    if time_df is None:
+        time_df = _extract_time_features_pandas(df[columns])
+    
+    # 小时/星期/月份取值范围很小，统一压缩为int8以减少后续聚合的内存带宽
+    time_df = time_df.astype({'hour': np.int8, 'day_of_week': np.int8, 'month': np.int8})
+    # 日期保留为datetime64（截断到当天零点），分组走整数路径而不是Python date对象
+    time_df['date'] = time_df['发布时间'].dt.normalize()
+    time_df['is_weekend'] = time_df['day_of_week'] >= 5  # Saturday, Sunday
+    
+    return time_df
+
+def _ensure_time_df(df: pd.DataFrame) -> pd.DataFrame:
+    """已预处理的数据直接返回，否则先提取时间特征"""
+    if set(TIME_FEATURE_COLUMNS).issubset(df.columns):
+        return df
+    return prepare_time_df(df)
+
+def _weekday_hour_grid(time_df: pd.DataFrame) -> np.ndarray:
+    """统计星期×小时的7×24发布量网格，用一次bincount代替groupby+pivot"""
+    cell_index = time_df['day_of_week'].to_numpy(dtype=np.int64) * 24 + time_df['hour'].to_numpy(dtype=np.int64)
+    return np.bincount(cell_index, minlength=168).reshape(7, 24)
+
+@cache_data(ttl=1800, show_spinner=False, by_identity=True)
+def _daily_counts(time_df: pd.DataFrame) -> pd.Series:
+    """按日期统计发布量（按日期排序），发布模式和时间趋势分析共用同一结果"""
+    return time_df.groupby('date', sort=True).size()
+
 class TimeAnalyzer:
     """时间行为分析器"""
     
+    # 实例经st.cache_resource在所有会话间共享，只允许持有只读的可视化器和配置，分析结果交给会话级cache_data
+    __slots__ = ('visualizer', 'viz_config')
+    
     def __init__(self):
         self.visualizer = UserBehaviorVisualizer()
         self.viz_config = get_config('viz')
     
-    @cache_data(ttl=1800)
+    @cache_data(ttl=1800, by_identity=True)
     def analyze_posting_patterns(self, df: pd.DataFrame) -> dict:
         """分析发布时间模式"""
         analysis = {}
@@ -38,58 +146,47 @@ class TimeAnalyzer:
         if '发布时间' not in df.columns:
             return analysis
         
-        # 确保发布时间是datetime类型
-        df_temp = df.copy()
-        df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-        df_temp = df_temp.dropna(subset=['发布时间'])
+        df_temp = _ensure_time_df(df)
         
         if df_temp.empty:
             return analysis
         
-        # 提取时间特征
-        df_temp['hour'] = df_temp['发布时间'].dt.hour
-        df_temp['day_of_week'] = df_temp['发布时间'].dt.dayofweek  # 0=Monday
-        df_temp['day_name'] = df_temp['发布时间'].dt.day_name()
-        df_temp['month'] = df_temp['发布时间'].dt.month
-        df_temp['date'] = df_temp['发布时间'].dt.date
-        
-        # 小时分布
-        hourly_dist = df_temp['hour'].value_counts().sort_index()
-        analysis['hourly_distribution'] = hourly_dist.to_dict()
+        # 各分布统一输出为{'index': 数组, 'values': 数组}，渲染时直接传给plotly
+        # 小时分布（固定24个桶，无发布的小时计为0）
+        hour_counts = np.bincount(df_temp['hour'].to_numpy(dtype=np.int64), minlength=24)
+        analysis['hourly_distribution'] = {'index': np.arange(24), 'values': hour_counts}
         
-        # 星期分布
-        weekly_dist = df_temp['day_name'].value_counts()
-        analysis['weekly_distribution'] = weekly_dist.to_dict()
+        # 星期分布（按整数星期计数，输出时再映射为星期名称）
+        weekday_counts = np.bincount(df_temp['day_of_week'].to_numpy(dtype=np.int64), minlength=7)
+        analysis['weekly_distribution'] = {'index': np.array(DAY_NAMES), 'values': weekday_counts}
         
         # 月份分布
         monthly_dist = df_temp['month'].value_counts().sort_index()
-        analysis['monthly_distribution'] = monthly_dist.to_dict()
+        analysis['monthly_distribution'] = {'index': monthly_dist.index.to_numpy(), 'values': monthly_dist.to_numpy()}
         
         # 日期分布（时间序列）
-        daily_dist = df_temp['date'].value_counts().sort_index()
-        analysis['daily_distribution'] = daily_dist.to_dict()
+        daily_dist = _daily_counts(df_temp)
+        analysis['daily_distribution'] = {'index': daily_dist.index.to_numpy(), 'values': daily_dist.to_numpy()}
         
         # 活跃时段分析
         analysis['peak_hours'] = {
-            'most_active_hour': hourly_dist.idxmax(),
-            'least_active_hour': hourly_dist.idxmin(),
-            'morning_posts': hourly_dist[6:12].sum(),  # 6-12点
-            'afternoon_posts': hourly_dist[12:18].sum(),  # 12-18点
-            'evening_posts': hourly_dist[18:24].sum(),  # 18-24点
-            'night_posts': hourly_dist[0:6].sum()  # 0-6点
+            'most_active_hour': int(hour_counts.argmax()),
+            'least_active_hour': int(hour_counts.argmin()),
+            'morning_posts': int(hour_counts[6:12].sum()),  # 6-12点
+            'afternoon_posts': int(hour_counts[12:18].sum()),  # 12-18点
+            'evening_posts': int(hour_counts[18:24].sum()),  # 18-24点
+            'night_posts': int(hour_counts[0:6].sum())  # 0-6点
         }
         
-        # 工作日vs周末
-        df_temp['is_weekend'] = df_temp['day_of_week'].isin([5, 6])  # Saturday, Sunday
-        weekend_analysis = df_temp.groupby('is_weekend').size()
+        # 工作日vs周末（直接由星期计数求和，周六、周日为索引5、6）
         analysis['weekend_vs_weekday'] = {
-            'weekday_posts': weekend_analysis.get(False, 0),
-            'weekend_posts': weekend_analysis.get(True, 0)
+            'weekday_posts': int(weekday_counts[:5].sum()),
+            'weekend_posts': int(weekday_counts[5:].sum())
         }
         
         return analysis
     
-    @cache_data(ttl=1800)
+    @cache_data(ttl=1800, by_identity=True)
     def analyze_user_activity_patterns(self, df: pd.DataFrame) -> dict:
         """分析用户活跃模式"""
         analysis = {}
@@ -97,18 +194,14 @@ class TimeAnalyzer:
         if '发布时间' not in df.columns or '用户ID' not in df.columns:
             return analysis
         
-        # 确保发布时间是datetime类型
-        df_temp = df.copy()
-        df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-        df_temp = df_temp.dropna(subset=['发布时间'])
+        df_temp = _ensure_time_df(df)
         
         if df_temp.empty:
             return analysis
         
         # 用户活跃天数统计
-        user_active_days = df_temp.groupby('用户ID')['发布时间'].apply(
-            lambda x: x.dt.date.nunique()
-        )
+        # 对datetime64日期列去重计数（按本地日期），避免逐组调用Python lambda
+        user_active_days = df_temp['date'].groupby(df_temp['用户ID']).nunique()
         analysis['user_active_days'] = {
             'mean': user_active_days.mean(),
             'median': user_active_days.median(),
@@ -118,28 +211,31 @@ class TimeAnalyzer:
         }
         
         # 用户发布频率分析
-        df_temp['date'] = df_temp['发布时间'].dt.date
-        user_daily_posts = df_temp.groupby(['用户ID', 'date']).size().reset_index(name='daily_posts')
-        user_avg_daily_posts = user_daily_posts.groupby('用户ID')['daily_posts'].mean()
+        # 各活跃日发布量的均值即总发布量除以活跃天数，无需构造(用户, 日期)中间表
+        posts_per_user = df_temp.groupby('用户ID').size()
+        user_avg_daily_posts = posts_per_user / user_active_days
         
         analysis['user_posting_frequency'] = {
             'avg_posts_per_day': user_avg_daily_posts.mean(),
             'median_posts_per_day': user_avg_daily_posts.median(),
             'high_frequency_users': (user_avg_daily_posts > 5).sum(),  # 每天超过5条
-            'low_frequency_users': (user_avg_daily_posts < 1).sum()   # 每天少于1条
+            'low_frequency_users': (user_avg_daily_posts < 1).sum(),   # 每天少于1条
+            'total_users': int(user_avg_daily_posts.size)
         }
         
         # 用户活跃时段偏好
-        df_temp['hour'] = df_temp['发布时间'].dt.hour
-        user_hour_preference = df_temp.groupby('用户ID')['hour'].apply(
-            lambda x: x.mode().iloc[0] if not x.mode().empty else x.mean()
-        )
-        
-        # 按时段分类用户
-        morning_users = (user_hour_preference.between(6, 12)).sum()
-        afternoon_users = (user_hour_preference.between(12, 18)).sum()
-        evening_users = (user_hour_preference.between(18, 24)).sum()
-        night_users = (user_hour_preference.between(0, 6)).sum()
+        # 每个用户发布最多的小时（并列时取最早的小时，与mode()一致）
+        hour_counts = df_temp.groupby(['用户ID', 'hour']).size().reset_index(name='count')
+        user_hour_preference = hour_counts.sort_values(
+            ['用户ID', 'count', 'hour'], ascending=[True, False, True], kind='stable'
+        ).drop_duplicates('用户ID')['hour']
+        
+        # 按时段分类用户（区间两端均包含，与between保持一致）
+        preferred_hours = np.bincount(user_hour_preference.to_numpy(dtype=np.int64), minlength=24)
+        morning_users = preferred_hours[6:13].sum()
+        afternoon_users = preferred_hours[12:19].sum()
+        evening_users = preferred_hours[18:24].sum()
+        night_users = preferred_hours[0:7].sum()
         
         analysis['user_time_preference'] = {
             'morning_users': morning_users,
@@ -150,7 +246,7 @@ class TimeAnalyzer:
         
         return analysis
     
-    @cache_data(ttl=1800)
+    @cache_data(ttl=1800, by_identity=True)
     def analyze_temporal_trends(self, df: pd.DataFrame) -> dict:
         """分析时间趋势"""
         analysis = {}
@@ -158,24 +254,22 @@ class TimeAnalyzer:
         if '发布时间' not in df.columns:
             return analysis
         
-        # 确保发布时间是datetime类型
-        df_temp = df.copy()
-        df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-        df_temp = df_temp.dropna(subset=['发布时间'])
+        df_temp = _ensure_time_df(df)
         
         if df_temp.empty:
             return analysis
         
         # 按日期统计发布量
-        df_temp['date'] = df_temp['发布时间'].dt.date
-        daily_posts = df_temp['date'].value_counts().sort_index()
+        daily_posts = _daily_counts(df_temp)
+        analysis['daily_series'] = daily_posts
         
         # 计算趋势
         if len(daily_posts) > 1:
-            # 简单线性趋势
-            x = np.arange(len(daily_posts))
-            y = daily_posts.values
-            trend_slope = np.polyfit(x, y, 1)[0]
+            # 简单线性趋势（一次拟合直接用最小二乘闭式解，无需构造范德蒙矩阵）
+            x = np.arange(len(daily_posts), dtype=np.float64)
+            y = daily_posts.to_numpy(dtype=np.float64)
+            x_centered = x - x.mean()
+            trend_slope = (x_centered * (y - y.mean())).sum() / (x_centered ** 2).sum()
             
             analysis['trend_analysis'] = {
                 'trend_slope': trend_slope,
@@ -187,7 +281,6 @@ class TimeAnalyzer:
             }
         
         # 周期性分析
-        df_temp['day_of_week'] = df_temp['发布时间'].dt.dayofweek
         weekly_pattern = df_temp['day_of_week'].value_counts().sort_index()
         
         # 计算周期性强度（标准差/均值）
@@ -204,31 +297,25 @@ class TimeAnalyzer:
         if '发布时间' not in df.columns:
             return go.Figure()
         
-        # 确保发布时间是datetime类型
-        df_temp = df.copy()
-        df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-        df_temp = df_temp.dropna(subset=['发布时间'])
+        df_temp = _ensure_time_df(df)
         
         if df_temp.empty:
             return go.Figure()
         
-        # 提取小时和星期
-        df_temp['hour'] = df_temp['发布时间'].dt.hour
-        df_temp['day_of_week'] = df_temp['发布时间'].dt.dayofweek
-        
-        # 创建热力图数据
-        heatmap_data = df_temp.groupby(['day_of_week', 'hour']).size().reset_index(name='count')
-        heatmap_pivot = heatmap_data.pivot(index='day_of_week', columns='hour', values='count').fillna(0)
+        # 创建热力图数据（int32足够容纳计数，序列化体积更小）
+        heatmap_grid = _weekday_hour_grid(df_temp).astype(np.int32)
+        # 无发布的格子不显示数字标注
+        heatmap_text = np.where(heatmap_grid > 0, heatmap_grid.astype(str), '')
         
         # 星期标签
-        day_labels = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_labels = DAY_NAMES
         
         fig = go.Figure(data=go.Heatmap(
-            z=heatmap_pivot.values,
+            z=heatmap_grid,
             x=list(range(24)),
             y=day_labels,
             colorscale='Blues',
-            text=heatmap_pivot.values,
+            text=heatmap_text,
             texttemplate="%{text}",
             textfont={"size": 10}
         ))
@@ -242,6 +329,11 @@ class TimeAnalyzer:
         
         return fig
 
+@st.cache_resource
+def _get_analyzer() -> TimeAnalyzer:
+    """分析器只在进程内创建一次，避免每次页面重跑都重新构造可视化器和读取配置；分析器不保存任何会话数据"""
+    return TimeAnalyzer()
+
 def main():
     """主函数"""
     st.title("⏰ 时间行为分析")
@@ -264,7 +356,10 @@ def main():
         st.error("❌ 数据中缺少发布时间字段，无法进行时间分析")
         st.stop()
     
-    analyzer = TimeAnalyzer()
+    analyzer = _get_analyzer()
+    
+    # 发布时间只解析一次，各分析视图共用预处理结果
+    time_df = prepare_time_df(df)
     
     # 侧边栏控制
     st.sidebar.subheader("⏰ 分析选项")
@@ -281,15 +376,15 @@ def main():
     
     # 根据选择的分析类型显示内容
     if analysis_type == "发布时间模式":
-        show_posting_patterns(df, analyzer)
+        show_posting_patterns(time_df, analyzer)
     elif analysis_type == "用户活跃模式":
-        show_user_activity_patterns(df, analyzer)
+        show_user_activity_patterns(time_df, analyzer)
     elif analysis_type == "时间趋势分析":
-        show_temporal_trends(df, analyzer)
+        show_temporal_trends(time_df, analyzer)
     elif analysis_type == "时间热力图":
-        show_time_heatmap(df, analyzer)
+        show_time_heatmap(time_df, analyzer)
     elif analysis_type == "综合时间报告":
-        show_comprehensive_time_report(df, analyzer)
+        show_comprehensive_time_report(time_df, analyzer)
 
 def show_posting_patterns(df: pd.DataFrame, analyzer: TimeAnalyzer):
     """显示发布时间模式"""
@@ -312,10 +407,10 @@ def show_posting_patterns(df: pd.DataFrame, analyzer: TimeAnalyzer):
             
             fig_hourly = go.Figure(data=[
                 go.Bar(
-                    x=list(hourly_data.keys()),
-                    y=list(hourly_data.values()),
+                    x=hourly_data['index'],
+                    y=hourly_data['values'],
                     marker_color=analyzer.visualizer.color_palette[0],
-                    text=list(hourly_data.values()),
+                    text=hourly_data['values'],
                     textposition='auto'
                 )
             ])
@@ -332,16 +427,13 @@ def show_posting_patterns(df: pd.DataFrame, analyzer: TimeAnalyzer):
             st.write("**星期发布分布**")
             weekly_data = posting_analysis['weekly_distribution']
             
-            # 重新排序星期
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            ordered_weekly_data = {day: weekly_data.get(day, 0) for day in day_order}
-            
+            # 分析结果已按周一至周日排序
             fig_weekly = go.Figure(data=[
                 go.Bar(
-                    x=list(ordered_weekly_data.keys()),
-                    y=list(ordered_weekly_data.values()),
+                    x=weekly_data['index'],
+                    y=weekly_data['values'],
                     marker_color=analyzer.visualizer.color_palette[1],
-                    text=list(ordered_weekly_data.values()),
+                    text=weekly_data['values'],
                     textposition='auto'
                 )
             ])
@@ -469,7 +561,7 @@ def show_user_activity_patterns(df: pd.DataFrame, analyzer: TimeAnalyzer):
             # 用户频率分布
             freq_categories = {
                 '低频用户(<1条/天)': freq_stats['low_frequency_users'],
-                '中频用户(1-5条/天)': max(0, len(df['用户ID'].unique()) - freq_stats['high_frequency_users'] - freq_stats['low_frequency_users']),
+                '中频用户(1-5条/天)': max(0, freq_stats['total_users'] - freq_stats['high_frequency_users'] - freq_stats['low_frequency_users']),
                 '高频用户(>5条/天)': freq_stats['high_frequency_users']
             }
             
@@ -571,21 +663,23 @@ def show_temporal_trends(df: pd.DataFrame, analyzer: TimeAnalyzer):
         else:
             st.info(f"➡️ 发布量保持稳定，斜率：{trend_slope:.3f}")
         
-        # 绘制时间序列图
-        if '发布时间' in df.columns:
-            df_temp = df.copy()
-            df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-            df_temp = df_temp.dropna(subset=['发布时间'])
-            df_temp['date'] = df_temp['发布时间'].dt.date
+        # 绘制时间序列图（直接复用分析结果中的每日发布量序列）
+        if 'daily_series' in trend_analysis:
+            daily_posts = trend_analysis['daily_series']
             
-            daily_posts = df_temp['date'].value_counts().sort_index()
+            # 日期一次性向量化转为ISO字符串，两条曲线共用
+            date_index = daily_posts.index
+            if date_index.tz is not None:
+                date_index = date_index.tz_localize(None)
+            date_labels = date_index.to_numpy(dtype='datetime64[D]').astype(str)
+            post_counts = daily_posts.to_numpy()
             
             fig_trend = go.Figure()
             
             # 添加实际数据
             fig_trend.add_trace(go.Scatter(
-                x=daily_posts.index,
-                y=daily_posts.values,
+                x=date_labels,
+                y=post_counts,
                 mode='lines+markers',
                 name='每日发布量',
                 line=dict(color=analyzer.visualizer.color_palette[0])
@@ -593,10 +687,10 @@ def show_temporal_trends(df: pd.DataFrame, analyzer: TimeAnalyzer):
             
             # 添加趋势线
             x_numeric = np.arange(len(daily_posts))
-            trend_line = np.polyval([trend_slope, daily_posts.values[0]], x_numeric)
+            trend_line = np.polyval([trend_slope, post_counts[0]], x_numeric)
             
             fig_trend.add_trace(go.Scatter(
-                x=daily_posts.index,
+                x=date_labels,
                 y=trend_line,
                 mode='lines',
                 name='趋势线',
@@ -644,22 +738,16 @@ def show_time_heatmap(df: pd.DataFrame, analyzer: TimeAnalyzer):
         st.subheader("💡 热力图洞察")
         
         # 分析最活跃的时间段
-        df_temp = df.copy()
-        df_temp['发布时间'] = pd.to_datetime(df_temp['发布时间'], errors='coerce')
-        df_temp = df_temp.dropna(subset=['发布时间'])
+        df_temp = _ensure_time_df(df)
         
         if not df_temp.empty:
-            df_temp['hour'] = df_temp['发布时间'].dt.hour
-            df_temp['day_of_week'] = df_temp['发布时间'].dt.dayofweek
-            
             # 找出最活跃的时间点
-            time_counts = df_temp.groupby(['day_of_week', 'hour']).size()
-            max_time = time_counts.idxmax()
-            max_count = time_counts.max()
+            time_grid = _weekday_hour_grid(df_temp)
+            peak_day_index, peak_hour = np.unravel_index(time_grid.argmax(), time_grid.shape)
+            max_count = time_grid[peak_day_index, peak_hour]
             
             day_names = ['周一', '周二', '周三', '周四', '周五', '周六', '周日']
-            peak_day = day_names[max_time[0]]
-            peak_hour = max_time[1]
+            peak_day = day_names[peak_day_index]
             
             insights = [
                 f"🔥 最活跃时间：{peak_day} {peak_hour}:00，发布量：{max_count}",
@@ -5,7 +5,14 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import sys
+import warnings
 from pathlib import Path
+from typing import Optional
+
+try:
+    import polars as pl
+except ImportError:  # Polars为可选依赖，未安装时全部使用numpy计算
+    pl = None
 
 # 添加项目路径
 sys.path.append(str(Path(__file__).parent.parent))
@@ -21,6 +28,138 @@ st.set_page_config(
     layout="wide"
 )
 
+# 活跃度（微博数）和影响力（粉丝数）分级：各级上界（含上界），最后一级无上界
+ACTIVITY_LEVEL_BOUNDS = [100, 1000, 5000]
+ACTIVITY_LEVELS = ['低活跃', '中活跃', '高活跃', '超高活跃']
+INFLUENCE_LEVEL_BOUNDS = [100, 1000, 10000]
+INFLUENCE_LEVELS = ['微影响力', '小影响力', '中影响力', '大影响力']
+
+# 取值有限的字符串列，统一转为category以便在整数编码上统计
+CATEGORY_COLUMNS = ['性别', '注册省份', '注册城市', '发布来源']
+
+def _level_codes(series: pd.Series, upper_bounds: list) -> np.ndarray:
+    """一次searchsorted把数值列映射为int8分级编码，缺失或无法解析的值编码为-1"""
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    codes = np.searchsorted(upper_bounds, values, side='left').astype(np.int8)
+    codes[np.isnan(values)] = -1
+    return codes
+
+def _count_levels(codes: np.ndarray, labels: list) -> dict:
+    """按分级编码统计各级人数，忽略缺失值"""
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return dict(zip(labels, counts.tolist()))
+
+# 活跃度指标统计量名称
+METRIC_STATS = ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75']
+
+def _metric_stats_polars(df: pd.DataFrame, metrics: list) -> dict:
+    """用一个Polars LazyFrame查询同时计算各指标的全部统计量"""
+    lf = pl.from_pandas(df[metrics], include_index=False).lazy().select(
+        [pl.col(metric).cast(pl.Float64, strict=False) for metric in metrics]
+    )
+    
+    exprs = []
+    for metric in metrics:
+        col = pl.col(metric)
+        exprs += [
+            col.mean().alias(f'{metric}|mean'),
+            col.median().alias(f'{metric}|median'),
+            col.std().alias(f'{metric}|std'),
+            col.min().alias(f'{metric}|min'),
+            col.max().alias(f'{metric}|max'),
+            col.quantile(0.25, interpolation='linear').alias(f'{metric}|q25'),
+            col.quantile(0.75, interpolation='linear').alias(f'{metric}|q75'),
+        ]
+    row = lf.select(exprs).collect().row(0, named=True)
+    
+    # 空列在Polars中得到None，统一为NaN与numpy版本一致
+    return {
+        metric: {stat: np.nan if row[f'{metric}|{stat}'] is None else float(row[f'{metric}|{stat}']) for stat in METRIC_STATS}
+        for metric in metrics
+    }
+
+def _metric_stats_numpy(df: pd.DataFrame, metrics: list) -> dict:
+    """各指标拼成一个矩阵，按列一次算完全部统计量"""
+    values = _numeric_view(df, metrics)
+    with warnings.catch_warnings():
+        # 整列缺失时结果为NaN，与pandas一致，不需要提示
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0, ddof=1)
+        mins = np.nanmin(values, axis=0)
+        maxs = np.nanmax(values, axis=0)
+        q25s, medians, q75s = np.nanpercentile(values, [25, 50, 75], axis=0)
+    
+    return {
+        metric: {
+            'mean': float(means[i]),
+            'median': float(medians[i]),
+            'std': float(stds[i]),
+            'min': float(mins[i]),
+            'max': float(maxs[i]),
+            'q25': float(q25s[i]),
+            'q75': float(q75s[i])
+        }
+        for i, metric in enumerate(metrics)
+    }
+
+def _influence_scores(followers: np.ndarray, weibo_posts: np.ndarray,
+                      reposts: Optional[np.ndarray] = None) -> np.ndarray:
+    """计算影响力评分，在两个预分配缓冲区上原地运算，不产生逐步的临时数组；缺少转发数时省去该项"""
+    scores = np.empty(len(followers), dtype=np.float32)
+    term = np.empty_like(scores)
+    
+    np.log1p(followers, out=scores)
+    scores *= 0.4
+    np.log1p(weibo_posts, out=term)
+    term *= 0.3
+    scores += term
+    if reposts is not None:
+        np.log1p(reposts, out=term)
+        term *= 0.3
+        scores += term
+    return scores
+
+# 粉丝数、点赞数等计数常超过2^24，float32无法精确表示，数值数组统一用float64
+def _numeric_view(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """将多列转为float64数值矩阵（每列一列），无法解析或缺失的值为NaN"""
+    return np.column_stack([
+        pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in columns
+    ])
+
+def _numeric_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    """将列转为float64数值数组，无法解析或缺失的值记为0"""
+    return pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+def _top_counts(series: pd.Series, k: int) -> pd.Series:
+    """统计出现次数最多的k个取值，只对候选取值排序而不是全部取值（并列时按首次出现顺序）"""
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    
+    if len(counts) > k:
+        # 第k大的计数作为门槛，只保留不低于门槛的候选
+        threshold = np.partition(counts, len(counts) - k)[len(counts) - k]
+        candidates = np.flatnonzero(counts >= threshold)
+    else:
+        candidates = np.arange(len(counts))
+    
+    top = candidates[np.argsort(-counts[candidates], kind='stable')][:k]
+    return pd.Series(counts[top], index=np.asarray(uniques[top]))
+
+def _frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """DataFrame缓存指纹：形状、列名、索引哈希加等距抽样行的内容哈希，不逐个哈希全部数值"""
+    sample_step = max(1, len(df) // 1000)
+    return (
+        df.shape,
+        tuple(df.columns),
+        int(pd.util.hash_pandas_object(df.index, index=False).sum()),
+        int(pd.util.hash_pandas_object(df.iloc[::sample_step], index=False).sum())
+    )
+
+# 分析方法的缓存配置：筛选视图频繁变化，限制每个方法保留的结果数
+_CACHE_OPTIONS = dict(ttl=1800, max_entries=16, hash_funcs={pd.DataFrame: _frame_fingerprint})
+
 class UserProfileAnalyzer:
     """用户画像分析器"""
     
@@ -28,9 +167,35 @@ class UserProfileAnalyzer:
         self.visualizer = UserBehaviorVisualizer()
         self.viz_config = get_config('viz')
     
-    @cache_data(ttl=1800)
+    @staticmethod
+    def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+        """将取值有限的字符串列转为category（浅拷贝，不修改传入的数据），已转换时直接返回"""
+        convert_columns = [
+            col for col in CATEGORY_COLUMNS
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)
+        ]
+        if not convert_columns:
+            return df
+        
+        df = df.copy(deep=False)
+        for col in convert_columns:
+            df[col] = df[col].astype('category')
+        return df
+    
+    @cache_data(show_spinner=False, **_CACHE_OPTIONS)
+    def _bin_columns(self, df: pd.DataFrame) -> dict:
+        """计算活跃度/影响力分级编码，供各分析方法和用户细分共用"""
+        bins = {}
+        if '微博数' in df.columns:
+            bins['activity_bins'] = _level_codes(df['微博数'], ACTIVITY_LEVEL_BOUNDS)
+        if '粉丝数' in df.columns:
+            bins['influence_bins'] = _level_codes(df['粉丝数'], INFLUENCE_LEVEL_BOUNDS)
+        return bins
+    
+    @cache_data(**_CACHE_OPTIONS)
     def analyze_basic_attributes(self, df: pd.DataFrame) -> dict:
         """分析基础属性"""
+        df = self._prepare(df)
         analysis = {}
         
         # 性别分布
@@ -40,138 +205,134 @@ class UserProfileAnalyzer:
         
         # 地域分布
         if '注册省份' in df.columns:
-            province_dist = df['注册省份'].value_counts().head(10)
-            analysis['province_distribution'] = province_dist.to_dict()
+            analysis['province_distribution'] = _top_counts(df['注册省份'], 10)
         
         if '注册城市' in df.columns:
-            city_dist = df['注册城市'].value_counts().head(10)
-            analysis['city_distribution'] = city_dist.to_dict()
+            analysis['city_distribution'] = _top_counts(df['注册城市'], 10)
         
         # 用户规模统计
-        analysis['total_users'] = len(df['用户ID'].unique()) if '用户ID' in df.columns else len(df)
+        analysis['total_users'] = df['用户ID'].nunique(dropna=False) if '用户ID' in df.columns else len(df)
         
         return analysis
     
-    @cache_data(ttl=1800)
+    @cache_data(**_CACHE_OPTIONS)
     def analyze_activity_levels(self, df: pd.DataFrame) -> dict:
         """分析活跃度水平"""
+        df = self._prepare(df)
         analysis = {}
         
         activity_metrics = ['微博数', '关注数', '粉丝数']
         available_metrics = [m for m in activity_metrics if m in df.columns]
         
-        for metric in available_metrics:
-            # 确保数据类型为数值型
-            data = pd.to_numeric(df[metric], errors='coerce').dropna()
-            analysis[metric] = {
-                'mean': data.mean(),
-                'median': data.median(),
-                'std': data.std(),
-                'min': data.min(),
-                'max': data.max(),
-                'q25': data.quantile(0.25),
-                'q75': data.quantile(0.75)
-            }
+        if available_metrics:
+            metric_stats = None
+            if pl is not None:
+                try:
+                    metric_stats = _metric_stats_polars(df, available_metrics)
+                except Exception:
+                    # 混合类型对象列等Polars无法处理的情况回退到numpy
+                    metric_stats = None
+            if metric_stats is None:
+                metric_stats = _metric_stats_numpy(df, available_metrics)
+            analysis.update(metric_stats)
         
         # 活跃度分级
         if '微博数' in df.columns:
-            weibo_counts = pd.to_numeric(df['微博数'], errors='coerce').dropna()
-            analysis['activity_levels'] = {
-                '低活跃(0-100)': (weibo_counts <= 100).sum(),
-                '中活跃(101-1000)': ((weibo_counts > 100) & (weibo_counts <= 1000)).sum(),
-                '高活跃(1001-5000)': ((weibo_counts > 1000) & (weibo_counts <= 5000)).sum(),
-                '超高活跃(5000+)': (weibo_counts > 5000).sum()
-            }
+            analysis['activity_levels'] = _count_levels(
+                self._bin_columns(df)['activity_bins'],
+                ['低活跃(0-100)', '中活跃(101-1000)', '高活跃(1001-5000)', '超高活跃(5000+)']
+            )
         
         return analysis
     
-    @cache_data(ttl=1800)
+    @cache_data(**_CACHE_OPTIONS)
     def analyze_influence_metrics(self, df: pd.DataFrame) -> dict:
         """分析影响力指标"""
+        df = self._prepare(df)
         analysis = {}
         
         # 粉丝影响力分析
         if '粉丝数' in df.columns:
-            followers = pd.to_numeric(df['粉丝数'], errors='coerce').dropna()
-            analysis['influence_levels'] = {
-                '微影响力(0-100)': (followers <= 100).sum(),
-                '小影响力(101-1000)': ((followers > 100) & (followers <= 1000)).sum(),
-                '中影响力(1001-10000)': ((followers > 1000) & (followers <= 10000)).sum(),
-                '大影响力(10000+)': (followers > 10000).sum()
-            }
+            analysis['influence_levels'] = _count_levels(
+                self._bin_columns(df)['influence_bins'],
+                ['微影响力(0-100)', '小影响力(101-1000)', '中影响力(1001-10000)', '大影响力(10000+)']
+            )
         
         # 互动影响力分析
         interaction_metrics = ['转发数', '评论数', '点赞数']
         available_interactions = [m for m in interaction_metrics if m in df.columns]
         
         if available_interactions:
-            # 计算总互动数
-            df_temp = df.copy()
-            interaction_cols = [col for col in available_interactions if col in df_temp.columns]
-            # 确保交互数据为数值型
-            for col in interaction_cols:
-                df_temp[col] = pd.to_numeric(df_temp[col], errors='coerce').fillna(0)
-            df_temp['total_interactions'] = df_temp[interaction_cols].sum(axis=1)
-            
-            total_interactions = df_temp['total_interactions']
+            # 计算总互动数（直接在数值数组上累加，不复制整个DataFrame）
+            total_interactions = sum(_numeric_values(df, col) for col in available_interactions)
+            top_10_threshold, top_1_threshold = np.nanquantile(total_interactions, [0.9, 0.99])
             analysis['interaction_influence'] = {
-                'mean_interactions': total_interactions.mean(),
-                'top_10_percent_threshold': total_interactions.quantile(0.9),
-                'top_1_percent_threshold': total_interactions.quantile(0.99)
+                'mean_interactions': float(np.nanmean(total_interactions)),
+                'top_10_percent_threshold': float(top_10_threshold),
+                'top_1_percent_threshold': float(top_1_threshold)
             }
         
         # 影响力综合评分
         if '粉丝数' in df.columns and '微博数' in df.columns:
-            df_temp = df.copy()
-            # 确保数据为数值型
-            df_temp['粉丝数'] = pd.to_numeric(df_temp['粉丝数'], errors='coerce').fillna(0)
-            df_temp['微博数'] = pd.to_numeric(df_temp['微博数'], errors='coerce').fillna(0)
-            if '转发数' in df_temp.columns:
-                df_temp['转发数'] = pd.to_numeric(df_temp['转发数'], errors='coerce').fillna(0)
+            reposts = _numeric_values(df, '转发数') if '转发数' in df.columns else None
             # 简单的影响力评分算法
-            df_temp['influence_score'] = (
-                np.log1p(df_temp['粉丝数']) * 0.4 +
-                np.log1p(df_temp['微博数']) * 0.3 +
-                np.log1p(df_temp.get('转发数', 0)) * 0.3
+            influence_score = _influence_scores(
+                _numeric_values(df, '粉丝数'), _numeric_values(df, '微博数'), reposts
             )
             
             analysis['influence_score_stats'] = {
-                'mean': df_temp['influence_score'].mean(),
-                'std': df_temp['influence_score'].std(),
-                'top_10_percent': df_temp['influence_score'].quantile(0.9)
+                'mean': float(np.nanmean(influence_score, dtype=np.float64)),
+                'std': float(np.nanstd(influence_score, ddof=1, dtype=np.float64)),
+                'top_10_percent': float(np.nanquantile(influence_score, 0.9))
             }
         
         return analysis
     
-    @cache_data(ttl=1800)
+    @cache_data(**_CACHE_OPTIONS)
     def create_user_segments(self, df: pd.DataFrame) -> pd.DataFrame:
         """创建用户细分"""
-        df_segment = df.copy()
+        # 只保留分群依据的两列再附加分级结果，不复制整张表
+        df_segment = df[[col for col in ('微博数', '粉丝数') if col in df.columns]].copy()
         
         # 基于活跃度和影响力的用户分群
         if '微博数' in df.columns and '粉丝数' in df.columns:
+            bins = self._bin_columns(df)
+            
             # 活跃度分级
-            df_segment['activity_level'] = pd.cut(
-                df_segment['微博数'],
-                bins=[0, 100, 1000, 5000, float('inf')],
-                labels=['低活跃', '中活跃', '高活跃', '超高活跃']
+            df_segment['activity_level'] = pd.Categorical.from_codes(
+                bins['activity_bins'], categories=ACTIVITY_LEVELS, ordered=True
             )
             
             # 影响力分级
-            df_segment['influence_level'] = pd.cut(
-                df_segment['粉丝数'],
-                bins=[0, 100, 1000, 10000, float('inf')],
-                labels=['微影响力', '小影响力', '中影响力', '大影响力']
+            df_segment['influence_level'] = pd.Categorical.from_codes(
+                bins['influence_bins'], categories=INFLUENCE_LEVELS, ordered=True
             )
             
-            # 用户类型组合
-            df_segment['user_type'] = (
-                df_segment['activity_level'].astype(str) + ' + ' +
-                df_segment['influence_level'].astype(str)
-            )
+            # 用户类型组合：两级编码合成一个整数编码，只为有限的组合生成一次标签
+            # 任一分级缺失时编码为-1，用户类型随之为缺失值
+            activity_codes = bins['activity_bins']
+            influence_codes = bins['influence_bins']
+            type_labels = [f'{act} + {inf}' for act in ACTIVITY_LEVELS for inf in INFLUENCE_LEVELS]
+            type_codes = np.where(
+                (activity_codes < 0) | (influence_codes < 0), -1,
+                activity_codes * len(INFLUENCE_LEVELS) + influence_codes
+            ).astype(np.int8)
+            df_segment['user_type'] = pd.Categorical.from_codes(
+                type_codes, categories=type_labels
+            ).remove_unused_categories()
         
         return df_segment
 
+@cache_data(ttl=600, max_entries=8, show_spinner=False, hash_funcs=_CACHE_OPTIONS['hash_funcs'])
+def _dashboard_metrics(df: pd.DataFrame) -> dict:
+    """缓存数据概览指标，切换分析类型时不重复计算"""
+    return create_dashboard_metrics(df)
+
+@st.cache_resource
+def _get_analyzer() -> UserProfileAnalyzer:
+    """分析器在进程内只创建一次，使分析方法的缓存键在页面重跑之间保持稳定"""
+    return UserProfileAnalyzer()
+
 def main():
     """主函数"""
     st.title("👥 用户画像分析")
@@ -189,7 +350,16 @@ def main():
         st.error("❌ 数据获取失败，请返回主页重新加载数据")
         st.stop()
     
-    analyzer = UserProfileAnalyzer()
+    analyzer = _get_analyzer()
+    
+    # 字符串分类列按会话只转换一次，页面重跑时直接复用，各分析和图表共用
+    prepared = st.session_state.get('_user_profile_prepared')
+    if prepared is not None and prepared[0] is df:
+        df = prepared[1]
+    else:
+        source_df = df
+        df = analyzer._prepare(df)
+        st.session_state['_user_profile_prepared'] = (source_df, df)
     
     # 侧边栏控制
     st.sidebar.subheader("📊 分析选项")
@@ -201,7 +371,7 @@ def main():
     
     # 数据概览
     st.subheader("📈 数据概览")
-    metrics = create_dashboard_metrics(df)
+    metrics = _dashboard_metrics(df)
     display_metrics_cards(metrics)
     
     # 根据选择的分析类型显示内容
@@ -255,16 +425,14 @@ def show_basic_attributes_analysis(df: pd.DataFrame, analyzer: UserProfileAnalyz
     with col2:
         if 'province_distribution' in basic_analysis:
             st.write("**省份统计 (Top 5)**")
-            province_df = pd.DataFrame(list(basic_analysis['province_distribution'].items())[:5],
-                                     columns=['省份', '用户数'])
+            province_df = basic_analysis['province_distribution'].head(5).rename_axis('省份').reset_index(name='用户数')
             province_df['占比'] = (province_df['用户数'] / df.shape[0] * 100).round(2)
             st.dataframe(province_df, use_container_width=True)
     
     with col3:
         if 'city_distribution' in basic_analysis:
             st.write("**城市统计 (Top 5)**")
-            city_df = pd.DataFrame(list(basic_analysis['city_distribution'].items())[:5],
-                                 columns=['城市', '用户数'])
+            city_df = basic_analysis['city_distribution'].head(5).rename_axis('城市').reset_index(name='用户数')
             city_df['占比'] = (city_df['用户数'] / df.shape[0] * 100).round(2)
             st.dataframe(city_df, use_container_width=True)
 
@@ -287,17 +455,19 @@ def show_activity_analysis(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
         with col1:
             st.write("**活跃度分级**")
             activity_levels = activity_analysis['activity_levels']
+            # 以numpy数组传给Plotly，序列化时整体编码而不是逐个Python对象处理
             fig_levels = go.Figure(data=[
                 go.Bar(
-                    x=list(activity_levels.keys()),
-                    y=list(activity_levels.values()),
+                    x=np.fromiter(activity_levels.keys(), dtype=object, count=len(activity_levels)),
+                    y=np.fromiter(activity_levels.values(), dtype=np.int64, count=len(activity_levels)),
                     marker_color=analyzer.visualizer.color_palette[:len(activity_levels)]
                 )
             ])
             fig_levels.update_layout(
                 title="用户活跃度分级分布",
                 xaxis_title="活跃度等级",
-                yaxis_title="用户数量"
+                yaxis_title="用户数量",
+                uirevision='const'
             )
             st.plotly_chart(fig_levels, use_container_width=True)
         
@@ -354,12 +524,12 @@ def show_influence_analysis(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
             influence_levels = influence_analysis['influence_levels']
             fig_influence_levels = go.Figure(data=[
                 go.Pie(
-                    labels=list(influence_levels.keys()),
-                    values=list(influence_levels.values()),
+                    labels=np.fromiter(influence_levels.keys(), dtype=object, count=len(influence_levels)),
+                    values=np.fromiter(influence_levels.values(), dtype=np.int64, count=len(influence_levels)),
                     hole=0.3
                 )
             ])
-            fig_influence_levels.update_layout(title="用户影响力分级")
+            fig_influence_levels.update_layout(title="用户影响力分级", uirevision='const')
             st.plotly_chart(fig_influence_levels, use_container_width=True)
     
     with col2:
@@ -400,28 +570,35 @@ def show_user_segmentation(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
     if 'user_type' in df_segment.columns:
         # 用户类型分布
         st.write("**用户类型分布**")
-        user_type_dist = df_segment['user_type'].value_counts().head(10)
+        # 用户类型组合数有限，直接对类别编码计数后排序，不在整列上做value_counts
+        user_types = df_segment['user_type'].cat
+        type_codes = user_types.codes.to_numpy()
+        type_counts = np.bincount(type_codes[type_codes >= 0], minlength=len(user_types.categories))
+        type_order = np.argsort(-type_counts, kind='stable')
+        type_order = type_order[type_counts[type_order] > 0]
+        type_labels = user_types.categories.to_numpy()[type_order]
+        top_types = type_order[:10]
         
         fig_segments = go.Figure(data=[
             go.Bar(
-                x=user_type_dist.values,
-                y=user_type_dist.index,
+                x=type_counts[top_types],
+                y=type_labels[:10],
                 orientation='h',
-                marker_color=analyzer.visualizer.color_palette[:len(user_type_dist)]
+                marker_color=analyzer.visualizer.color_palette[:len(top_types)]
             )
         ])
         fig_segments.update_layout(
             title="用户类型分布 (Top 10)",
             xaxis_title="用户数量",
             yaxis_title="用户类型",
-            height=500
+            height=500,
+            uirevision='const'
         )
         st.plotly_chart(fig_segments, use_container_width=True)
         
         # 细分统计表
         st.write("**用户细分统计**")
-        segment_stats = df_segment['user_type'].value_counts().reset_index()
-        segment_stats.columns = ['用户类型', '用户数量']
+        segment_stats = pd.DataFrame({'用户类型': type_labels, '用户数量': type_counts[type_order]})
         segment_stats['占比(%)'] = (segment_stats['用户数量'] / segment_stats['用户数量'].sum() * 100).round(2)
         st.dataframe(segment_stats, use_container_width=True)
     
@@ -429,16 +606,27 @@ def show_user_segmentation(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
     if 'activity_level' in df_segment.columns and 'influence_level' in df_segment.columns:
         st.subheader("📊 用户细分矩阵")
         
-        # 创建交叉表
-        cross_tab = pd.crosstab(df_segment['activity_level'], df_segment['influence_level'])
+        # 创建交叉表：4×4个组合直接按整数编码计数，不经过crosstab的分组
+        activity_codes = df_segment['activity_level'].cat.codes.to_numpy()
+        influence_codes = df_segment['influence_level'].cat.codes.to_numpy()
+        valid = (activity_codes >= 0) & (influence_codes >= 0)
+        cell_counts = np.bincount(
+            activity_codes[valid].astype(np.intp) * len(INFLUENCE_LEVELS) + influence_codes[valid],
+            minlength=len(ACTIVITY_LEVELS) * len(INFLUENCE_LEVELS)
+        )
+        cross_tab = pd.DataFrame(
+            cell_counts.reshape(len(ACTIVITY_LEVELS), len(INFLUENCE_LEVELS)),
+            index=ACTIVITY_LEVELS, columns=INFLUENCE_LEVELS
+        )
         
         # 热力图
+        matrix_values = np.ascontiguousarray(cross_tab.to_numpy(dtype=np.int64))
         fig_matrix = go.Figure(data=go.Heatmap(
-            z=cross_tab.values,
-            x=cross_tab.columns,
-            y=cross_tab.index,
+            z=matrix_values,
+            x=np.asarray(INFLUENCE_LEVELS, dtype=object),
+            y=np.asarray(ACTIVITY_LEVELS, dtype=object),
             colorscale='Blues',
-            text=cross_tab.values,
+            text=matrix_values,
             texttemplate="%{text}",
             textfont={"size": 12}
         ))
@@ -446,7 +634,8 @@ def show_user_segmentation(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
         fig_matrix.update_layout(
             title="活跃度 × 影响力 用户分布矩阵",
             xaxis_title="影响力等级",
-            yaxis_title="活跃度等级"
+            yaxis_title="活跃度等级",
+            uirevision='const'
         )
         st.plotly_chart(fig_matrix, use_container_width=True)
 
@@ -485,7 +674,7 @@ def show_comprehensive_profile(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
     
     # 地域洞察
     if 'province_distribution' in basic_analysis:
-        top_province = list(basic_analysis['province_distribution'].keys())[0]
+        top_province = basic_analysis['province_distribution'].index[0]
         insights.append(f"🗺️ 用户主要集中在{top_province}地区")
     
     for insight in insights:
@@ -526,7 +715,7 @@ def show_comprehensive_profile(df: pd.DataFrame, analyzer: UserProfileAnalyzer):
     
     👥 **人群特征**：{list(basic_analysis.get('gender_distribution', {}).keys())[0] if basic_analysis.get('gender_distribution') else '未知'}性用户占主导地位
     
-    🗺️ **地域特征**：主要分布在{list(basic_analysis.get('province_distribution', {}).keys())[0] if basic_analysis.get('province_distribution') else '未知'}等地区
+    🗺️ **地域特征**：主要分布在{basic_analysis['province_distribution'].index[0] if len(basic_analysis.get('province_distribution', ())) else '未知'}等地区
     
     ⚡ **活跃特征**：平均发布{activity_analysis.get('微博数', {}).get('mean', 0):.0f}条微博
     
@@ -20,21 +20,22 @@ def create_test_data():
     """创建测试数据"""
     np.random.seed(42)
     n_samples = 1000
+    sample_ids = np.arange(n_samples).astype(str)
     
     data = {
-        '用户ID': [f'user_{i:04d}' for i in range(n_samples)],
-        '用户名': [f'用户{i}' for i in range(n_samples)],
-        '微博内容': [f'这是第{i}条微博内容，包含一些测试文本' for i in range(n_samples)],
-        '发布时间': pd.date_range('2023-01-01', periods=n_samples, freq='H'),
-        '发布来源': np.random.choice(['iPhone客户端', 'Android客户端', '网页版'], n_samples),
+        '用户ID': np.char.add('user_', np.char.zfill(sample_ids, 4)),
+        '用户名': np.char.add('用户', sample_ids),
+        '微博内容': np.char.add(np.char.add('这是第', sample_ids), '条微博内容，包含一些测试文本'),
+        '发布时间': pd.date_range('2023-01-01', periods=n_samples, freq='h'),
+        '发布来源': pd.Categorical(np.random.choice(['iPhone客户端', 'Android客户端', '网页版'], n_samples)),
         '转发数': np.random.randint(0, 1000, n_samples),
         '评论数': np.random.randint(0, 500, n_samples),
         '点赞数': np.random.randint(0, 2000, n_samples),
         '关注数': np.random.randint(10, 10000, n_samples),
         '粉丝数': np.random.randint(0, 50000, n_samples),
-        '注册城市': np.random.choice(['北京', '上海', '广州', '深圳', '杭州'], n_samples),
-        '注册省份': np.random.choice(['北京市', '上海市', '广东省', '浙江省'], n_samples),
-        '性别': np.random.choice(['男', '女', '未知'], n_samples),
+        '注册城市': pd.Categorical(np.random.choice(['北京', '上海', '广州', '深圳', '杭州'], n_samples)),
+        '注册省份': pd.Categorical(np.random.choice(['北京市', '上海市', '广东省', '浙江省'], n_samples)),
+        '性别': pd.Categorical(np.random.choice(['男', '女', '未知'], n_samples)),
         '年龄': np.random.randint(18, 65, n_samples)
     }
     
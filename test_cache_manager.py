@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存管理功能测试脚本
+测试StreamlitCacheManager磁盘缓存的保存、重新加载和过期
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# 添加项目路径
+sys.path.append(str(Path(__file__).parent))
+
+from utils.cache_manager import StreamlitCacheManager
+
+def test_disk_cache_reload():
+    """测试不带TTL的磁盘缓存在新进程中重新加载后仍然有效，带TTL的缓存过期后被删除"""
+    print("=" * 60)
+    print("磁盘缓存重新加载测试")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        writer = StreamlitCacheManager(cache_dir)
+        writer._save_to_disk('plain', {'value': 1})
+        writer._save_to_disk('expiring', {'value': 2}, ttl=1)
+
+        # 新实例没有进程内副本，只能从磁盘读取
+        reader = StreamlitCacheManager(cache_dir)
+        assert reader._load_from_disk('plain') == {'value': 1}, "不带TTL的缓存读取失败"
+        assert reader._load_from_disk('expiring') == {'value': 2}, "未过期的TTL缓存读取失败"
+
+        # 再次重新加载，不带TTL的缓存不能在第一次读取后被删除
+        reader = StreamlitCacheManager(cache_dir)
+        assert reader._load_from_disk('plain') == {'value': 1}, "不带TTL的缓存在读取后丢失"
+
+        time.sleep(1.1)
+        reader = StreamlitCacheManager(cache_dir)
+        assert reader._load_from_disk('expiring') is None, "过期的TTL缓存仍被返回"
+        assert sorted(os.listdir(cache_dir)) == ['plain.pkl'], f"缓存文件异常: {os.listdir(cache_dir)}"
+
+    print("   ✅ 磁盘缓存重新加载和过期正常")
+    return True
+
+def test_session_cache_in_place_edit():
+    """测试DataFrame被原地修改后会话缓存不再返回旧结果"""
+    print("=" * 60)
+    print("会话缓存原地修改测试")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        manager = StreamlitCacheManager(cache_dir)
+
+        for by_identity in (False, True):
+            @manager.cache_data(show_spinner=False, by_identity=by_identity)
+            def total(df: pd.DataFrame) -> int:
+                return int(df['value'].sum())
+
+            df = pd.DataFrame({'value': [1, 1, 1, 1, 1]})
+            assert total(df) == 5
+            df.loc[2, 'value'] = 100
+            assert total(df) == 104, f"by_identity={by_identity}时返回了修改前的结果"
+
+    print("   ✅ 原地修改后缓存键随之变化")
+    return True
+
+if __name__ == "__main__":
+    print("开始缓存管理功能测试...\n")
+
+    if test_disk_cache_reload() and test_session_cache_in_place_edit():
+        print("🎉 所有测试通过！缓存管理功能正常工作。")
+    else:
+        print("⚠️ 部分测试失败，请检查相关功能。")
@@ -16,6 +16,17 @@ sys.path.append(str(Path(__file__).parent))
 
 from utils.data_loader import BigDataLoader, DataProcessor
 
+def _count_inf(df: pd.DataFrame) -> int:
+    """统计数值列中的无穷大值，整块转换为数组后一次计数"""
+    numeric_block = df.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64, copy=False)
+    return int(np.count_nonzero(np.isinf(numeric_block)))
+
+def _count_na(df: pd.DataFrame) -> int:
+    """统计缺失值：浮点列合并为一个数组用自比较计数，其余列整体转换后一次判断"""
+    float_block = df.select_dtypes(include=['floating']).to_numpy(dtype=np.float64, na_value=np.nan)
+    other_block = df.select_dtypes(exclude=['floating']).to_numpy()
+    return int(np.count_nonzero(float_block != float_block) + np.count_nonzero(pd.isna(other_block)))
+
 def test_data_loading():
     """测试数据加载功能"""
     print("=" * 60)
@@ -50,20 +61,17 @@ def test_data_loading():
         print(f"   内存使用: {sample_df.memory_usage(deep=True).sum() / 1024:.2f} KB")
         
         # 检查数据质量
-        print(f"   缺失值数量: {sample_df.isnull().sum().sum()}")
+        print(f"   缺失值数量: {_count_na(sample_df)}")
         print(f"   重复行数量: {sample_df.duplicated().sum()}")
         
         # 3. 测试数据预处理
         print("\n3. 测试数据预处理...")
-        processed_df = DataProcessor.preprocess_data(sample_df.copy())
+        processed_df = DataProcessor.preprocess_data(sample_df)
         print(f"   预处理后形状: {processed_df.shape}")
-        print(f"   预处理后缺失值: {processed_df.isnull().sum().sum()}")
+        print(f"   预处理后缺失值: {_count_na(processed_df)}")
         
         # 检查是否有无穷大值
-        numeric_cols = processed_df.select_dtypes(include=[np.number]).columns
-        inf_count = 0
-        for col in numeric_cols:
-            inf_count += np.isinf(processed_df[col]).sum()
+        inf_count = _count_inf(processed_df)
         print(f"   无穷大值数量: {inf_count}")
         
         # 4. 测试分块加载（小规模测试）
@@ -156,11 +164,11 @@ def test_error_handling():
         processed = DataProcessor.preprocess_data(test_data)
         
         # 检查无穷大值是否被处理
-        inf_count = np.isinf(processed.select_dtypes(include=[np.number])).sum().sum()
+        inf_count = _count_inf(processed)
         print(f"   ✅ 异常值处理成功，剩余无穷大值: {inf_count}")
         
         # 检查缺失值是否被处理
-        null_count = processed.isnull().sum().sum()
+        null_count = _count_na(processed)
         print(f"   ✅ 缺失值处理成功，剩余缺失值: {null_count}")
         
     except Exception as e:
@@ -170,12 +178,45 @@ def test_error_handling():
     print("\n✅ 所有错误处理测试通过！")
     return True
 
+def test_large_id_precision():
+    """测试超过2^53的ID在类型优化后保持精确"""
+    print("\n" + "=" * 60)
+    print("大整数ID精度测试")
+    print("=" * 60)
+    
+    loader = BigDataLoader()
+    ids = [9007199254740993, 1234567890123456789, 4891234567890123457]
+    for source in (ids, [str(i) for i in ids]):
+        df = pd.DataFrame({'用户ID': source, '微博ID': source, '地点ID': source})
+        optimized = loader.optimize_dtypes(df)
+        for col in ['用户ID', '微博ID', '地点ID']:
+            assert optimized[col].tolist() == ids, f"{col}精度丢失: {optimized[col].tolist()}"
+    
+    print("   ✅ 大整数ID转换后保持精确")
+    return True
+
+def test_shrink_dtypes_arithmetic():
+    """测试降级后的计数列相加不会回绕"""
+    print("\n" + "=" * 60)
+    print("数值列降级运算测试")
+    print("=" * 60)
+    
+    df = pd.DataFrame({'分享数': [120, 100, 3], '收藏数': [30000, 30000, 1], '经度': [116.5, 121.25, 0.0]})
+    shrunk = BigDataLoader.shrink_dtypes(df)
+    assert shrunk['分享数'].dtype == np.int32, f"整数列降级类型错误: {shrunk['分享数'].dtype}"
+    assert shrunk['经度'].dtype == np.float32, f"浮点列未降级: {shrunk['经度'].dtype}"
+    total = shrunk['分享数'] + shrunk['分享数'] + shrunk['收藏数'] + shrunk['收藏数']
+    assert total.tolist() == [60240, 60200, 8], f"相加结果回绕: {total.tolist()}"
+    
+    print("   ✅ 降级后的整数列相加结果正确")
+    return True
+
 if __name__ == "__main__":
     print("开始数据加载功能测试...\n")
     
     # 运行测试
     test1_passed = test_data_loading()
-    test2_passed = test_error_handling()
+    test2_passed = test_error_handling() and test_large_id_precision() and test_shrink_dtypes_arithmetic()
     
     # 总结
     print("\n" + "=" * 60)
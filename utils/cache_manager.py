@@ -1,47 +1,219 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import hashlib
 import pickle
+import json
 import os
+import weakref
+import pyarrow as pa
+import pyarrow.feather as feather
 from typing import Any, Optional, Callable
 from functools import wraps
+from collections import OrderedDict
 import time
 
+# 磁盘缓存文件后缀：DataFrame为Feather数据文件加JSON元数据，其他对象为pickle
+DISK_CACHE_SUFFIXES = ('.pkl', '.feather', '.meta.json')
+
 class StreamlitCacheManager:
     """
     Streamlit缓存管理器，提供更灵活的缓存控制
     """
     
+    # 进程内保留的已解码磁盘缓存结果数，重复读取同一结果时跳过反序列化
+    MEMORY_CACHE_SIZE = 8
+    # 按对象身份取键时额外抽样哈希的行数
+    IDENTITY_SAMPLE_ROWS = 1000
+    
     def __init__(self, cache_dir: str = "streamlit_cache"):
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self._memory = OrderedDict()
+    
+    @classmethod
+    def _hash_arg(cls, value: Any, hash_funcs: Optional[dict], by_identity: bool = False) -> Any:
+        """按参数类型使用自定义哈希函数生成参数指纹，未匹配的参数原样返回
+        
+        by_identity: 为True时未指定哈希函数的DataFrame以(id, 形状, 列名, 列类型, 抽样行哈希)作为指纹
+        """
+        if hash_funcs:
+            for arg_type, hash_func in hash_funcs.items():
+                if isinstance(value, arg_type):
+                    return hash_func(value)
+        if by_identity and cls._keyed_by_identity(value, hash_funcs):
+            return ('DataFrame', id(value), value.shape, tuple(value.columns),
+                    tuple(str(dtype) for dtype in value.dtypes), cls._sample_digest(value))
+        return value
+    
+    @classmethod
+    def _sample_digest(cls, df: pd.DataFrame) -> str:
+        """对固定位置的等距抽样行（含首尾行）取哈希，id被复用或数据被原地修改时缓存键随之变化"""
+        positions = np.unique(np.linspace(0, len(df) - 1, num=min(len(df), cls.IDENTITY_SAMPLE_ROWS), dtype=np.int64))
+        sample = df.iloc[positions]
+        hasher = hashlib.blake2b(digest_size=16)
+        try:
+            hasher.update(pd.util.hash_pandas_object(sample, index=True).to_numpy().tobytes())
+        except TypeError:
+            # 含不可哈希元素（如列表）的object列退回字符串表示
+            hasher.update(sample.to_string().encode())
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def _keyed_by_identity(value: Any, hash_funcs: Optional[dict]) -> bool:
+        """判断参数是否为需按对象身份生成缓存键的DataFrame"""
+        if not isinstance(value, pd.DataFrame):
+            return False
+        return not (hash_funcs and any(isinstance(value, arg_type) for arg_type in hash_funcs))
+    
+    @staticmethod
+    def _discard_session_entry(cache_key: str) -> None:
+        """删除会话缓存中的结果，回收时可能已不在Streamlit会话上下文中，失败时忽略"""
+        try:
+            st.session_state.pop(cache_key, None)
+        except Exception:
+            pass
     
     def _get_cache_key(self, func_name: str, *args, **kwargs) -> str:
-        """生成缓存键"""
-        cache_data = {
-            'func_name': func_name,
-            'args': str(args),
-            'kwargs': str(sorted(kwargs.items()))
-        }
-        cache_str = str(cache_data)
-        return hashlib.md5(cache_str.encode()).hexdigest()
+        """生成缓存键：逐个参数增量哈希，DataFrame等按底层数据哈希而不是生成字符串表示"""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(func_name.encode())
+        self._update_hash(hasher, args)
+        self._update_hash(hasher, kwargs)
+        return hasher.hexdigest()
+    
+    @classmethod
+    def _update_hash(cls, hasher, value: Any) -> None:
+        """按参数类型把内容写入哈希对象"""
+        hasher.update(type(value).__qualname__.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            if isinstance(value, pd.DataFrame):
+                schema = (list(value.columns), [str(dtype) for dtype in value.dtypes])
+            else:
+                schema = (value.name, str(value.dtype))
+            hasher.update(repr((value.shape, schema)).encode())
+            try:
+                hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+            except TypeError:
+                # 含不可哈希元素（如列表）的object列退回字符串表示
+                hasher.update(value.to_string().encode())
+        elif isinstance(value, np.ndarray):
+            hasher.update(repr((value.shape, str(value.dtype))).encode())
+            if value.dtype.hasobject:
+                hasher.update(repr(value.tolist()).encode())
+            else:
+                hasher.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, dict):
+            for item_key, item_value in sorted(value.items(), key=lambda item: repr(item[0])):
+                cls._update_hash(hasher, item_key)
+                cls._update_hash(hasher, item_value)
+        elif isinstance(value, (list, tuple)):
+            hasher.update(str(len(value)).encode())
+            for item in value:
+                cls._update_hash(hasher, item)
+        else:
+            hasher.update(repr(value).encode())
+            if isinstance(value, (str, os.PathLike)):
+                fingerprint = cls._path_fingerprint(value)
+                if fingerprint is not None:
+                    hasher.update(repr(fingerprint).encode())
+    
+    @staticmethod
+    def _path_fingerprint(value) -> Optional[tuple]:
+        """指向已有文件的参数取(修改时间, 大小)作为指纹，文件改动后缓存随之失效
+        
+        目录只识别Path对象或带路径分隔符的字符串，取其中各文件的名称、修改时间与大小
+        """
+        try:
+            stat = os.stat(value)
+        except (OSError, ValueError):
+            return None
+        
+        if os.path.isfile(value):
+            return (stat.st_mtime_ns, stat.st_size)
+        if os.path.isdir(value) and (not isinstance(value, str) or os.sep in value or '/' in value):
+            with os.scandir(value) as entries:
+                return tuple(sorted(
+                    (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) for entry in entries
+                ))
+        return None
     
     def _save_to_disk(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
-        """保存数据到磁盘"""
-        cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
+        """保存数据到磁盘，DataFrame写为Feather并用旁路元数据记录TTL，其他对象使用pickle"""
+        if isinstance(data, pd.DataFrame) and self._save_frame(key, data, ttl):
+            self._remember(key, data, time.time(), ttl)
+            return
+        
+        # 带TTL的pickle使用单独的文件名后缀，读取时据此识别修改时间中记录的过期时刻
+        cache_file = os.path.join(self.cache_dir, f"{key}.ttl.pkl" if ttl else f"{key}.pkl")
         cache_info = {
             'data': data,
             'timestamp': time.time(),
             'ttl': ttl
         }
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache_info, f)
+        
+        def write(path: str) -> None:
+            with open(path, 'wb') as f:
+                pickle.dump(cache_info, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        self._write_atomically(cache_file, write)
+        # 删除同一键另一种格式的旧文件，避免读取到过时的结果
+        self._remove_files(os.path.join(self.cache_dir, f"{key}.pkl" if ttl else f"{key}.ttl.pkl"))
+        if ttl:
+            # 把过期时刻写入文件修改时间，读取时一次stat即可判断是否过期
+            now = time.time()
+            os.utime(cache_file, (now, cache_info['timestamp'] + ttl))
+        self._remember(key, data, cache_info['timestamp'], ttl)
+    
+    def _save_frame(self, key: str, df: pd.DataFrame, ttl: Optional[int]) -> bool:
+        """以Feather V2（LZ4压缩）格式保存DataFrame，无法转换为Arrow（如混合类型的object列）时返回False"""
+        try:
+            table = pa.Table.from_pandas(df)
+            self._write_atomically(
+                os.path.join(self.cache_dir, f"{key}.feather"),
+                lambda path: feather.write_feather(table, path, compression='lz4')
+            )
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        
+        def write_meta(path: str) -> None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'timestamp': time.time(), 'ttl': ttl}, f)
+        
+        self._write_atomically(os.path.join(self.cache_dir, f"{key}.meta.json"), write_meta)
+        return True
+    
+    @staticmethod
+    def _write_atomically(cache_file: str, write: Callable[[str], None]) -> None:
+        """先写入临时文件再替换目标文件，写入中断时不会留下不完整的缓存文件"""
+        tmp_file = f"{cache_file}.tmp"
+        try:
+            write(tmp_file)
+            os.replace(tmp_file, cache_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
     
     def _load_from_disk(self, key: str) -> Optional[Any]:
-        """从磁盘加载数据"""
-        cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
-        if not os.path.exists(cache_file):
-            return None
+        """从磁盘加载数据，优先返回进程内已解码的结果"""
+        cached_data = self._recall(key)
+        if cached_data is not None:
+            return cached_data
+        
+        feather_file = os.path.join(self.cache_dir, f"{key}.feather")
+        if os.path.exists(feather_file):
+            return self._load_frame(key, feather_file)
+        
+        cache_file = os.path.join(self.cache_dir, f"{key}.ttl.pkl")
+        try:
+            # 带TTL的文件修改时间是过期时刻，已过期时不必读取和反序列化
+            if os.stat(cache_file).st_mtime < time.time():
+                os.remove(cache_file)
+                return None
+        except FileNotFoundError:
+            cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
+            if not os.path.exists(cache_file):
+                return None
         
         try:
             with open(cache_file, 'rb') as f:
@@ -53,6 +225,7 @@ class StreamlitCacheManager:
                     os.remove(cache_file)
                     return None
             
+            self._remember(key, cache_info['data'], cache_info['timestamp'], cache_info.get('ttl'))
             return cache_info['data']
         except Exception:
             # 缓存文件损坏，删除它
@@ -60,18 +233,89 @@ class StreamlitCacheManager:
                 os.remove(cache_file)
             return None
     
+    def _load_frame(self, key: str, feather_file: str) -> Optional[pd.DataFrame]:
+        """读取Feather缓存，先根据元数据检查TTL，过期或损坏时删除缓存文件"""
+        meta_file = os.path.join(self.cache_dir, f"{key}.meta.json")
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            
+            # 检查TTL
+            if meta.get('ttl') and time.time() - meta['timestamp'] > meta['ttl']:
+                self._remove_files(feather_file, meta_file)
+                return None
+            
+            df = feather.read_table(feather_file, memory_map=True).to_pandas()
+            self._remember(key, df, meta['timestamp'], meta.get('ttl'))
+            return df
+        except Exception:
+            # 缓存文件损坏，删除它
+            self._remove_files(feather_file, meta_file)
+            return None
+    
+    def _remember(self, key: str, data: Any, timestamp: float, ttl: Optional[int]) -> None:
+        """把磁盘缓存结果放入进程内LRU，超出容量时淘汰最久未使用的结果"""
+        expires_at = timestamp + ttl if ttl else None
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            # 与调用方持有的对象分离，调用方之后原地修改时不影响缓存
+            data = data.copy(deep=False)
+        self._memory[key] = (data, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+    
+    def _recall(self, key: str) -> Optional[Any]:
+        """从进程内LRU取结果，过期时丢弃并交给磁盘读取处理，pandas对象返回浅拷贝"""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        
+        data, expires_at = entry
+        if expires_at is not None and time.time() > expires_at:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        # 写时复制下浅拷贝不复制数据，调用方原地修改列或索引时不会影响缓存中的对象
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.copy(deep=False)
+        return data
+    
+    @staticmethod
+    def _remove_files(*paths: str) -> None:
+        """删除存在的缓存文件"""
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+    
     def cache_data(self, func: Callable = None, *, ttl: Optional[int] = None, 
-                   persist: bool = False, show_spinner: bool = True):
-        """缓存装饰器"""
+                   persist: bool = False, show_spinner: bool = True,
+                   max_entries: Optional[int] = None, hash_funcs: Optional[dict] = None,
+                   by_identity: bool = False):
+        """缓存装饰器
+        
+        max_entries: 会话缓存中该函数最多保留的结果数，超出时淘汰最久未使用的结果
+        hash_funcs: {类型: 函数}，对该类型的参数用函数返回值代替完整内容生成缓存键
+        by_identity: 会话缓存中的DataFrame参数按对象身份加抽样行哈希取键，不逐个单元格哈希；
+            只用于传入的DataFrame不会被原地修改的函数
+        """
+        identity_keys = by_identity and not persist
+        
         def decorator(func):
+            lru_key = f"_cache_lru_{func.__module__}.{func.__qualname__}"
+            
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # 生成缓存键
-                cache_key = self._get_cache_key(func.__name__, *args, **kwargs)
+                # 生成缓存键：显式要求时DataFrame参数按对象身份取键，否则按完整内容哈希
+                key_args = tuple(self._hash_arg(arg, hash_funcs, by_identity=identity_keys) for arg in args)
+                key_kwargs = {name: self._hash_arg(value, hash_funcs, by_identity=identity_keys)
+                              for name, value in kwargs.items()}
+                cache_key = self._get_cache_key(func.__name__, *key_args, **key_kwargs)
                 
                 # 尝试从Streamlit缓存加载
                 if not persist:
                     if cache_key in st.session_state:
+                        if max_entries is not None:
+                            self._track_lru(lru_key, cache_key, max_entries)
                         return st.session_state[cache_key]
                 else:
                     # 尝试从磁盘加载
@@ -89,6 +333,13 @@ class StreamlitCacheManager:
                 # 保存到缓存
                 if not persist:
                     st.session_state[cache_key] = result
+                    if max_entries is not None:
+                        self._track_lru(lru_key, cache_key, max_entries)
+                    # 按身份取键的DataFrame被回收后及时释放对应结果
+                    if identity_keys:
+                        for value in (*args, *kwargs.values()):
+                            if self._keyed_by_identity(value, hash_funcs):
+                                weakref.finalize(value, self._discard_session_entry, cache_key)
                 else:
                     self._save_to_disk(cache_key, result, ttl)
                 
@@ -101,8 +352,22 @@ class StreamlitCacheManager:
         else:
             return decorator(func)
     
+    @staticmethod
+    def _track_lru(lru_key: str, cache_key: str, max_entries: int) -> None:
+        """记录缓存键的使用顺序，超出上限时删除最久未使用的结果"""
+        if lru_key not in st.session_state:
+            st.session_state[lru_key] = OrderedDict()
+        lru = st.session_state[lru_key]
+        lru[cache_key] = None
+        lru.move_to_end(cache_key)
+        
+        while len(lru) > max_entries:
+            expired_key, _ = lru.popitem(last=False)
+            if expired_key in st.session_state:
+                del st.session_state[expired_key]
+    
     def clear_cache(self, pattern: Optional[str] = None) -> None:
-        """清空缓存"""
+        """清空缓存，指定pattern时只清除键或文件名包含该字符串的缓存"""
         # 清空session state
         if pattern:
             keys_to_remove = [key for key in st.session_state.keys() if pattern in key]
@@ -111,22 +376,35 @@ class StreamlitCacheManager:
         else:
             st.session_state.clear()
         
-        # 清空磁盘缓存
-        for file in os.listdir(self.cache_dir):
-            if file.endswith('.pkl'):
-                if pattern is None or pattern in file:
-                    os.remove(os.path.join(self.cache_dir, file))
+        # 清空磁盘缓存及其进程内副本
+        if pattern:
+            for key in [key for key in self._memory if pattern in key]:
+                del self._memory[key]
+        else:
+            self._memory.clear()
+        
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(DISK_CACHE_SUFFIXES) and (not pattern or pattern in entry.name):
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        # 其他会话已同时删除该文件
+                        pass
     
     def get_cache_info(self) -> dict:
         """获取缓存信息"""
         session_cache_size = len(st.session_state)
         
-        disk_cache_files = [f for f in os.listdir(self.cache_dir) if f.endswith('.pkl')]
-        disk_cache_size = len(disk_cache_files)
+        # 一次目录扫描同时取得文件名和大小，不再对每个文件单独stat
+        with os.scandir(self.cache_dir) as entries:
+            disk_cache_files = [entry for entry in entries if entry.name.endswith(DISK_CACHE_SUFFIXES)]
+        # Feather缓存附带一个元数据文件，缓存项数只统计数据文件
+        disk_cache_size = sum(1 for entry in disk_cache_files if not entry.name.endswith('.meta.json'))
         
         total_disk_size = sum(
-            os.path.getsize(os.path.join(self.cache_dir, f)) 
-            for f in disk_cache_files
+            entry.stat(follow_symlinks=False).st_size
+            for entry in disk_cache_files
         ) / (1024 * 1024)  # MB
         
         return {
@@ -141,30 +419,46 @@ cache_manager = StreamlitCacheManager()
 
 
 # 常用缓存装饰器
-def cache_data(func=None, *, ttl=None, persist=False, show_spinner=True):
+def cache_data(func=None, *, ttl=None, persist=False, show_spinner=True, max_entries=None, hash_funcs=None,
+               by_identity=False):
     """数据缓存装饰器"""
-    return cache_manager.cache_data(func, ttl=ttl, persist=persist, show_spinner=show_spinner)
+    return cache_manager.cache_data(func, ttl=ttl, persist=persist, show_spinner=show_spinner,
+                                    max_entries=max_entries, hash_funcs=hash_funcs, by_identity=by_identity)
 
 
 def cache_resource(func=None, *, ttl=None, show_spinner=True):
-    """资源缓存装饰器（持久化）"""
-    return cache_manager.cache_data(func, ttl=ttl, persist=True, show_spinner=show_spinner)
+    """资源缓存装饰器：交给st.cache_resource在进程内共享同一对象，模型等资源无需pickle到磁盘"""
+    decorator = st.cache_resource(ttl=ttl, show_spinner=show_spinner)
+    return decorator if func is None else decorator(func)
 
 
 class ProgressTracker:
     """进度跟踪器"""
     
+    # 进度百分比未变化时两次刷新之间的最小间隔（秒）
+    MIN_UPDATE_INTERVAL = 0.25
+    
     def __init__(self, total_steps: int, description: str = "处理中"):
         self.total_steps = total_steps
         self.current_step = 0
         self.description = description
         self.progress_bar = st.progress(0)
         self.status_text = st.empty()
+        self._last_emit_t = 0.0
+        self._last_pct = -1
     
     def update(self, step: int = 1, status: str = None):
-        """更新进度"""
+        """更新进度，在紧密循环中调用时合并刷新，避免每一步都向前端发送消息"""
         self.current_step += step
         progress = min(self.current_step / self.total_steps, 1.0)
+        
+        pct = int(progress * 100)
+        now = time.monotonic()
+        if pct == self._last_pct and now - self._last_emit_t < self.MIN_UPDATE_INTERVAL:
+            return
+        self._last_pct = pct
+        self._last_emit_t = now
+        
         self.progress_bar.progress(progress)
         
         if status:
@@ -201,13 +495,35 @@ class DataCache:
                 sample_size=processing_params.get('sample_size', 1000)
             )
         else:
-            # 分块加载并合并
-            chunks = []
+            # 分块加载并合并：每块读入后立即转换为Arrow表，不同时保留pandas分块；
+            # 拼接Arrow表只串联各块数据，再一次性转换为DataFrame。
+            # 结果已由本方法的磁盘缓存保存，读取时不再让加载器额外缓存全部分块
+            tables = []
+            chunks = None
             for chunk in loader.load_data_chunked(
                 file_path, 
-                chunk_size=processing_params.get('chunk_size', 10000)
+                chunk_size=processing_params.get('chunk_size', 10000),
+                use_cache=False
             ):
+                if chunks is None:
+                    try:
+                        tables.append(pa.Table.from_pandas(chunk, preserve_index=False))
+                        continue
+                    except (pa.ArrowException, TypeError, ValueError):
+                        # 出现Arrow无法表示的列（如混合类型的object列）后改为收集pandas分块
+                        chunks = [table.to_pandas() for table in tables]
                 chunks.append(chunk)
+            
+            if chunks is None:
+                try:
+                    table = pa.concat_tables(tables, promote_options='permissive')
+                except (pa.ArrowException, TypeError, ValueError):
+                    # 各块的列类型不一致（如仅部分块转成了category）时退回pandas合并
+                    chunks = [table.to_pandas() for table in tables]
+                else:
+                    del tables
+                    return table.to_pandas(split_blocks=True, self_destruct=True)
+            
             return pd.concat(chunks, ignore_index=True)
     
     @staticmethod
@@ -4,9 +4,32 @@ import os
 import pickle
 from typing import Iterator, Optional, Dict, Any, List
 import gc
-from functools import wraps
 import hashlib
 import json
+import shutil
+import uuid
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+try:
+    import polars as pl
+except ImportError:  # Polars为可选依赖，未安装时使用pandas读取CSV
+    pl = None
+
+try:
+    import python_calamine  # noqa: F401
+    # pandas 2.2起支持calamine引擎（Rust实现），解析xlsx远快于纯Python的openpyxl
+    EXCEL_ENGINE = 'calamine' if tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 2) else None
+except ImportError:  # 未安装python-calamine时使用pandas默认的openpyxl引擎
+    EXCEL_ENGINE = None
+
+# pandas 3.0起写时复制始终开启，浅拷贝修改时不会影响原数据；更早版本仍需深拷贝
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+def _writable_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """返回可以安全修改的副本，写时复制下只做浅拷贝"""
+    return df.copy(deep=not COPY_ON_WRITE)
 
 class BigDataLoader:
     """
@@ -32,23 +55,97 @@ class BigDataLoader:
         }
     
     def _get_cache_key(self, file_path: str, **kwargs) -> str:
-        """生成缓存键"""
+        """生成缓存键：按文件内容摘要而非路径和修改时间，复制或重新检出的文件仍能命中缓存"""
         cache_data = {
-            'file_path': file_path,
-            'file_mtime': os.path.getmtime(file_path),
+            'content_hash': self._file_content_hash(file_path),
             'kwargs': kwargs
         }
         cache_str = json.dumps(cache_data, sort_keys=True)
         return hashlib.md5(cache_str.encode()).hexdigest()
     
+    def _file_content_hash(self, file_path: str) -> str:
+        """计算文件内容摘要，大小和修改时间未变的文件直接复用_meta.json中记录的摘要"""
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        meta_file = os.path.join(self.cache_dir, '_meta.json')
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        
+        entry = meta.get(abs_path)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['digest']
+        
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(abs_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        
+        meta[abs_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        # 先写临时文件再替换，避免并发读取到写了一半的记录
+        tmp_file = f"{meta_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_file, meta_file)
+        except OSError:
+            pass
+        return digest
+    
     def _save_cache(self, key: str, data: Any) -> None:
-        """保存缓存"""
+        """保存缓存：DataFrame写为Arrow IPC文件，分块列表每块一个文件并附清单，其他对象使用pickle"""
+        try:
+            if isinstance(data, pd.DataFrame):
+                self._write_arrow(os.path.join(self.cache_dir, f"{key}.arrow"), data)
+                return
+            if isinstance(data, list) and all(isinstance(chunk, pd.DataFrame) for chunk in data):
+                shard_dir = self._new_shard_dir(key)
+                os.makedirs(shard_dir)
+                shards = []
+                try:
+                    for chunk in data:
+                        self._write_shard(shard_dir, shards, chunk)
+                except Exception:
+                    shutil.rmtree(shard_dir, ignore_errors=True)
+                    raise
+                self._publish_shards(key, shard_dir, shards)
+                return
+        except (pa.ArrowException, TypeError, ValueError):
+            # 含Arrow无法表示的列（如混合类型的object列）时退回pickle
+            self._remove_cache(key)
+        
         cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
         with open(cache_file, 'wb') as f:
             pickle.dump(data, f)
     
     def _load_cache(self, key: str) -> Optional[Any]:
-        """加载缓存"""
+        """加载缓存，Arrow文件以内存映射方式读取，分块缓存按清单逐块读取"""
+        arrow_file = os.path.join(self.cache_dir, f"{key}.arrow")
+        if os.path.exists(arrow_file):
+            try:
+                return self._read_arrow(arrow_file)
+            except Exception:
+                # 缓存文件损坏，删除它
+                os.remove(arrow_file)
+                return None
+        
+        manifest_file = os.path.join(self.cache_dir, key, 'manifest.json')
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    shards = json.load(f)['shards']
+                shard_files = [os.path.join(self.cache_dir, key, name) for name in shards]
+                if all(os.path.exists(path) for path in shard_files):
+                    return (self._read_arrow(path) for path in shard_files)
+            except Exception:
+                pass
+            # 清单损坏或分块缺失，删除整个分块目录
+            self._remove_cache(key)
+            return None
+        
         cache_file = os.path.join(self.cache_dir, f"{key}.pkl")
         if os.path.exists(cache_file):
             try:
@@ -59,12 +156,155 @@ class BigDataLoader:
                 os.remove(cache_file)
         return None
     
+    @staticmethod
+    def _write_arrow(path: str, df: pd.DataFrame) -> None:
+        """写入未压缩的Arrow IPC文件，读取时可直接内存映射"""
+        feather.write_feather(pa.Table.from_pandas(df), path, compression='uncompressed')
+    
+    def _write_shard(self, shard_dir: str, shards: List[str], chunk: pd.DataFrame) -> None:
+        """把一个分块写为分块目录中的下一个Arrow文件，并记入清单列表"""
+        shard_name = f"{len(shards):05d}.arrow"
+        self._write_arrow(os.path.join(shard_dir, shard_name), chunk)
+        shards.append(shard_name)
+    
+    @staticmethod
+    def _write_manifest(shard_dir: str, shards: List[str]) -> None:
+        """写入分块清单，清单最后写入，缺少清单的分块目录视为未完成的缓存"""
+        with open(os.path.join(shard_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({'shards': shards}, f)
+    
+    def _new_shard_dir(self, key: str) -> str:
+        """返回本次写入专用的临时分块目录路径，多个会话同时写同一缓存键时互不干扰"""
+        return os.path.join(self.cache_dir, f"{key}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    
+    def _publish_shards(self, key: str, tmp_dir: str, shards: List[str]) -> None:
+        """写入清单后把临时分块目录整体换到正式位置，失败时只放弃本次缓存"""
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            self._write_manifest(tmp_dir, shards)
+            os.replace(tmp_dir, os.path.join(self.cache_dir, key))
+        except OSError:
+            # 其他写入者已先发布了同一缓存键（内容相同），或磁盘写入失败
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _read_arrow(path: str) -> pd.DataFrame:
+        """以内存映射方式读取Arrow IPC文件"""
+        return feather.read_table(path, memory_map=True).to_pandas()
+    
+    def _remove_cache(self, key: str) -> None:
+        """删除某个缓存键对应的全部缓存文件"""
+        shard_dir = os.path.join(self.cache_dir, key)
+        if os.path.isdir(shard_dir):
+            shutil.rmtree(shard_dir, ignore_errors=True)
+        for suffix in ('.arrow', '.pkl'):
+            cache_file = os.path.join(self.cache_dir, f"{key}{suffix}")
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+    
+    @staticmethod
+    def _read_excel(file_path: str, **kwargs) -> pd.DataFrame:
+        """读取Excel文件，可用时使用calamine引擎"""
+        return pd.read_excel(file_path, engine=EXCEL_ENGINE, **kwargs)
+    
+    @staticmethod
+    def _read_head(file_path: str, nrows: int,
+                   usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        """读取CSV/Parquet文件的前nrows行，Polars可用时只扫描所需的行"""
+        if pl is not None:
+            try:
+                if file_path.endswith('.parquet'):
+                    lazy_frame = pl.scan_parquet(file_path)
+                else:
+                    # 只用要读取的行推断列类型，避免前100行之后类型变化导致解析失败
+                    lazy_frame = pl.scan_csv(file_path, infer_schema_length=max(nrows, 1))
+                if usecols is not None:
+                    lazy_frame = lazy_frame.select(usecols)
+                return lazy_frame.head(nrows).collect().to_pandas()
+            except Exception:
+                pass
+        
+        if file_path.endswith('.parquet'):
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=max(nrows, 1), columns=usecols)
+            batch = next(batches, None)
+            if batch is None:
+                return pq.read_schema(file_path).empty_table().to_pandas()
+            return batch.slice(0, nrows).to_pandas()
+        return pd.read_csv(file_path, nrows=nrows, usecols=usecols)
+    
+    @staticmethod
+    def _read_csv_chunks(file_path: str, chunk_size: int,
+                         usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """分批读取CSV，可用时由Polars多线程解析，每批在边界处转换为pandas"""
+        use_polars = (pl is not None and hasattr(pl.LazyFrame, 'collect_batches')
+                      and (usecols is None or all(isinstance(col, str) for col in usecols)))
+        if not use_polars:
+            yield from pd.read_csv(file_path, chunksize=chunk_size, usecols=usecols)
+            return
+        
+        # 按全文件推断列类型，避免后续批次出现与前100行不同的类型时解析失败
+        lazy_frame = pl.scan_csv(file_path, infer_schema_length=None)
+        if usecols is not None:
+            lazy_frame = lazy_frame.select(usecols)
+        # 与pandas分块读取一致，各批的行索引在整个文件中连续编号
+        offset = 0
+        for batch in lazy_frame.collect_batches(chunk_size=chunk_size):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+    
+    @staticmethod
+    def _cast_numeric_columns(df: pd.DataFrame, targets: Dict[str, str]) -> Optional[pd.DataFrame]:
+        """用一条Polars表达式链完成数值转换、缺失填充、截断和整数类型转换，不可用或失败时返回None"""
+        if pl is None or not targets:
+            return None
+        
+        try:
+            frame = pl.from_pandas(df[list(targets)])
+            exprs = []
+            for col, dtype in targets.items():
+                source_dtype = frame.schema[col]
+                if source_dtype.is_float():
+                    value = pl.col(col).fill_nan(None)
+                    # 无穷大值视为缺失，与其他缺失值一起用中位数填充
+                    value = pl.when(value.is_infinite()).then(None).otherwise(value)
+                    median = value.median()
+                else:
+                    # 整数和字符串列在整数域内转换，不经过Float64，超过2^53的ID也能保持精确
+                    value = pl.col(col)
+                    if not (source_dtype.is_integer() or source_dtype == pl.Boolean):
+                        text = value.cast(pl.String)
+                        # 无法按整数解析的值（如"12.0"）再按浮点解析后取整
+                        value = pl.coalesce(text.cast(pl.Int64, strict=False),
+                                            text.cast(pl.Float64, strict=False).cast(pl.Int64, strict=False))
+                    value = value.cast(pl.Int64, strict=False)
+                    # 中位数先取整再填充，避免整列被提升为Float64（与pandas路径一样向零取整）
+                    median = value.median().cast(pl.Int64)
+                # 全部缺失时填0
+                value = value.fill_null(median).fill_null(0)
+                if dtype in ('int16', 'int32'):
+                    bounds = np.iinfo(dtype)
+                    value = value.clip(bounds.min, bounds.max)
+                exprs.append(value.cast(getattr(pl, dtype.capitalize())).alias(col))
+            
+            return frame.lazy().with_columns(exprs).collect().to_pandas()
+        except Exception:
+            # 列内容无法转换为Polars（如混合类型的object列）时交给pandas逐列处理
+            return None
+    
     def optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """优化数据类型以减少内存使用"""
+        numeric_targets = {col: dtype for col, dtype in self.dtype_optimization.items()
+                           if col in df.columns and dtype != 'category'}
+        converted = self._cast_numeric_columns(df, numeric_targets)
+        
         for col, dtype in self.dtype_optimization.items():
             if col in df.columns:
                 if dtype == 'category':
                     df[col] = df[col].astype('category')
+                elif converted is not None:
+                    df[col] = converted[col].to_numpy()
                 else:
                     # 转换为数值类型并处理异常值
                     numeric_series = pd.to_numeric(df[col], errors='coerce')
@@ -92,19 +332,86 @@ class BigDataLoader:
                     
                     df[col] = numeric_series.astype(dtype)
         
+        # 发布时间在此解析一次，后续处理和可视化直接复用datetime列
+        if '发布时间' in df.columns and pd.api.types.is_string_dtype(df['发布时间']):
+            publish_time = pd.to_datetime(df['发布时间'], errors='coerce', cache=True)
+            # 只有全部非空值都能解析时才替换，避免格式不一致时原始值变成NaT
+            if publish_time.notna().sum() == df['发布时间'].notna().sum():
+                df['发布时间'] = publish_time
+        
         # 优化字符串列
         for col in df.select_dtypes(include=['object']).columns:
             if col not in self.dtype_optimization:
                 # 尝试转换为category如果唯一值较少
-                if len(df) > 0 and df[col].nunique() / len(df) < 0.5:
+                if self._is_low_cardinality(df[col]):
                     df[col] = df[col].astype('category')
         
+        return self.shrink_dtypes(df, skip=list(self.dtype_optimization))
+    
+    @staticmethod
+    def _is_low_cardinality(series: pd.Series, max_uniques: int = 10000,
+                            sample_size: int = 10000) -> bool:
+        """唯一值不超过max_uniques且占比低于一半时适合转为category
+        
+        大列先有放回地随机抽样：从max_uniques个均匀分布的取值中抽sample_size个，期望唯一值数为
+        max_uniques * (1 - exp(-sample_size / max_uniques))，取值更少或分布更偏时只会更低；
+        样本唯一值明显超过该值说明全列超出上限，不再对全列做哈希统计
+        """
+        if len(series) == 0:
+            return False
+        
+        if len(series) > sample_size:
+            positions = np.random.default_rng(0).integers(0, len(series), sample_size)
+            sample_uniques = series.iloc[positions].nunique()
+            # 留5%余量，避免抽样波动误判恰好处在上限附近的列
+            if sample_uniques > 1.05 * max_uniques * (1 - np.exp(-sample_size / max_uniques)):
+                return False
+        
+        uniques = series.nunique()
+        return uniques <= max_uniques and uniques / len(series) < 0.5
+    
+    @staticmethod
+    def shrink_dtypes(df: pd.DataFrame, int2uint: bool = False,
+                      skip: Optional[List[str]] = None,
+                      min_int_bits: int = 32) -> pd.DataFrame:
+        """把数值列降为能容纳其取值范围的最窄类型
+        
+        int2uint: 非负整数列是否使用无符号类型（无符号列相减会回绕，默认不启用）
+        skip: 不处理的列名
+        min_int_bits: 整数列最窄降到的位数；计数列会相加求总互动数等，
+            降到int8/int16后逐元素运算会静默回绕，默认不低于32位
+        浮点列只在转换为float32不损失精度时降级
+        """
+        skip = set(skip or [])
+        min_itemsize = min_int_bits // 8
+        for col in df.select_dtypes(include=['integer', 'floating']).columns:
+            if col in skip or not isinstance(df[col].dtype, np.dtype) or len(df[col]) == 0:
+                continue
+            
+            values = df[col].to_numpy()
+            if df[col].dtype.kind in 'iu':
+                c_min, c_max = values.min(), values.max()
+                candidates = [np.uint8, np.uint16, np.uint32, np.uint64] if int2uint and c_min >= 0 else []
+                candidates += [np.int8, np.int16, np.int32, np.int64]
+                candidates = [c for c in candidates if np.dtype(c).itemsize >= min_itemsize]
+                for candidate in candidates:
+                    bounds = np.iinfo(candidate)
+                    if c_min >= bounds.min and c_max <= bounds.max:
+                        if candidate != df[col].dtype:
+                            df[col] = values.astype(candidate)
+                        break
+            elif df[col].dtype == np.float64:
+                narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                    df[col] = narrowed
+        
         return df
     
     def load_data_chunked(self, file_path: str, chunk_size: int = 10000, 
                          usecols: Optional[List[str]] = None,
-                         use_cache: bool = True) -> Iterator[pd.DataFrame]:
-        """分块读取数据"""
+                         use_cache: bool = True,
+                         gc_between_chunks: bool = False) -> Iterator[pd.DataFrame]:
+        """分块读取数据，gc_between_chunks为True时每块之后执行一次垃圾回收"""
         cache_key = self._get_cache_key(file_path, chunk_size=chunk_size, usecols=usecols)
         
         if use_cache:
@@ -114,56 +421,85 @@ class BigDataLoader:
                     yield chunk
                 return
         
-        chunks = []
+        # 每个分块在产出时即写入本次读取专用的临时目录，不在内存中累积全部分块
+        shard_dir = self._new_shard_dir(cache_key) if use_cache else None
+        shards = []
+        
+        def cache_chunk(chunk: pd.DataFrame) -> Optional[str]:
+            """写入一个分块缓存，写入失败时只放弃本次缓存并返回None，数据读取照常继续"""
+            if shard_dir is None:
+                return None
+            try:
+                os.makedirs(shard_dir, exist_ok=True)
+                self._write_shard(shard_dir, shards, chunk)
+                return shard_dir
+            except (pa.ArrowException, TypeError, ValueError, OSError):
+                # 含Arrow无法表示的列（如混合类型的object列），或磁盘已满等写入错误
+                shutil.rmtree(shard_dir, ignore_errors=True)
+                return None
+        
         try:
             # 根据文件扩展名选择读取方法
             if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
                 # Excel文件不支持chunksize，需要先读取全部数据再分块
-                full_data = pd.read_excel(file_path, usecols=usecols)
+                full_data = self._read_excel(file_path, usecols=usecols)
                 
                 # 手动分块
                 for start in range(0, len(full_data), chunk_size):
                     end = min(start + chunk_size, len(full_data))
-                    chunk = full_data.iloc[start:end].copy()
+                    # optimize_dtypes会修改传入的分块，写时复制下切片不复制数据也不影响full_data
+                    chunk = _writable_copy(full_data.iloc[start:end])
                     
                     # 优化数据类型
                     chunk = self.optimize_dtypes(chunk)
-                    chunks.append(chunk)
+                    shard_dir = cache_chunk(chunk)
                     yield chunk
                     
-                    # 强制垃圾回收
-                    gc.collect()
+                    # 仅在调用方要求时强制垃圾回收，完整回收需扫描整个堆，代价随对象数增长
+                    if gc_between_chunks:
+                        gc.collect()
                     
                 # 清理完整数据以释放内存
                 del full_data
-                gc.collect()
                 
             elif file_path.endswith('.csv'):
-                reader = pd.read_csv(file_path, chunksize=chunk_size, usecols=usecols)
-                for chunk in reader:
+                for chunk in self._read_csv_chunks(file_path, chunk_size, usecols):
                     # 优化数据类型
                     chunk = self.optimize_dtypes(chunk)
-                    chunks.append(chunk)
+                    shard_dir = cache_chunk(chunk)
                     yield chunk
                     
-                    # 强制垃圾回收
-                    gc.collect()
+                    # 仅在调用方要求时强制垃圾回收，完整回收需扫描整个堆，代价随对象数增长
+                    if gc_between_chunks:
+                        gc.collect()
             else:
                 raise ValueError(f"不支持的文件格式: {file_path}")
             
-            # 保存到缓存
-            if use_cache:
-                self._save_cache(cache_key, chunks)
+            # 只有完整读完才写清单并发布缓存
+            if shard_dir is not None:
+                self._publish_shards(cache_key, shard_dir, shards)
+                shard_dir = None
                 
         except Exception as e:
             print(f"读取文件时出错: {e}")
             raise
+        finally:
+            # 出错或调用方提前关闭生成器时删除本次未完成的临时分块
+            if shard_dir is not None:
+                shutil.rmtree(shard_dir, ignore_errors=True)
     
     def load_data_sample(self, file_path: str, sample_size: int = 1000,
                         usecols: Optional[List[str]] = None,
-                        use_cache: bool = True) -> pd.DataFrame:
-        """加载数据样本用于快速分析"""
-        cache_key = self._get_cache_key(file_path, sample_size=sample_size, usecols=usecols)
+                        use_cache: bool = True,
+                        clean_outliers: bool = True,
+                        optimize: bool = True) -> pd.DataFrame:
+        """加载数据样本用于快速分析
+        
+        clean_outliers: 是否按IQR裁剪数值列的异常值
+        optimize: 是否优化数据类型，只需查看列结构时可关闭
+        """
+        cache_key = self._get_cache_key(file_path, sample_size=sample_size, usecols=usecols,
+                                        clean_outliers=clean_outliers, optimize=optimize)
         
         if use_cache:
             cached_data = self._load_cache(cache_key)
@@ -174,36 +510,29 @@ class BigDataLoader:
             # 读取前N行作为样本
             if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
                 # 对于Excel文件，先尝试读取原始数据
-                df = pd.read_excel(file_path, nrows=sample_size, usecols=usecols)
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, nrows=sample_size, usecols=usecols)
+                df = self._read_excel(file_path, nrows=sample_size, usecols=usecols)
+            elif file_path.endswith(('.csv', '.parquet')):
+                df = self._read_head(file_path, sample_size, usecols)
             else:
                 raise ValueError(f"不支持的文件格式: {file_path}")
             
-            # 数据清洗：处理异常值
-            for col in df.columns:
-                if df[col].dtype in ['object', 'string']:
-                    continue
-                    
+            # 数据清洗：处理异常值，一次计算所有数值列的四分位数后按列裁剪
+            numeric_cols = df.select_dtypes(include=[np.number]).columns if clean_outliers else []
+            if len(numeric_cols) > 0:
                 # 替换无穷大值为NaN
-                df[col] = df[col].replace([np.inf, -np.inf], np.nan)
+                numeric = df[numeric_cols].replace([np.inf, -np.inf], np.nan)
                 
-                # 对于数值列，检查是否有异常大的值
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    # 使用IQR方法检测异常值
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    
-                    # 设置合理的上下界
-                    lower_bound = Q1 - 3 * IQR
-                    upper_bound = Q3 + 3 * IQR
-                    
-                    # 将异常值替换为边界值
-                    df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
+                # 使用IQR方法检测异常值，设置合理的上下界
+                quartiles = numeric.quantile([0.25, 0.75])
+                Q1, Q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+                IQR = Q3 - Q1
+                
+                # 将异常值替换为边界值
+                df[numeric_cols] = numeric.clip(lower=Q1 - 3 * IQR, upper=Q3 + 3 * IQR, axis=1)
             
             # 优化数据类型
-            df = self.optimize_dtypes(df)
+            if optimize:
+                df = self.optimize_dtypes(df)
             
             if use_cache:
                 self._save_cache(cache_key, df)
@@ -223,8 +552,15 @@ class BigDataLoader:
             return cached_info
         
         try:
+            # Parquet/Arrow/CSV只读取文件尾或表头的结构信息，不解析数据行
+            schema_info = self._read_schema_info(file_path)
+            if schema_info is not None:
+                self._save_cache(cache_key, schema_info)
+                return schema_info
+            
             # 读取少量数据获取结构信息
-            sample_df = self.load_data_sample(file_path, sample_size=100, use_cache=False)
+            sample_df = self.load_data_sample(file_path, sample_size=100, use_cache=False,
+                                              clean_outliers=False, optimize=False)
             
             info = {
                 'columns': list(sample_df.columns),
@@ -241,39 +577,74 @@ class BigDataLoader:
             print(f"获取数据信息时出错: {e}")
             raise
     
+    @staticmethod
+    def _read_schema_info(file_path: str) -> Optional[Dict[str, Any]]:
+        """从文件元数据获取列名、类型和行数估计，Excel等需要解析数据的格式返回None"""
+        file_size = os.path.getsize(file_path)
+        if file_path.endswith('.parquet'):
+            metadata = pq.read_metadata(file_path)
+            schema = metadata.schema.to_arrow_schema()
+            num_rows = metadata.num_rows
+        elif file_path.endswith(('.arrow', '.feather')):
+            with pa.memory_map(file_path) as source:
+                reader = pa.ipc.open_file(source)
+                schema = reader.schema
+                num_rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        elif file_path.endswith('.csv') and pl is not None:
+            schema = pl.DataFrame(schema=pl.scan_csv(file_path).collect_schema()).to_arrow().schema
+            # 按文件开头1MiB的平均行长估计总行数
+            with open(file_path, 'rb') as f:
+                head = f.read(1 << 20)
+            lines = head.count(b'\n')
+            if len(head) < (1 << 20):
+                num_rows = max(lines - 1, 0) + (0 if head.endswith(b'\n') or not head else 1)
+            else:
+                num_rows = int(file_size / (len(head) / max(lines, 1))) - 1
+        else:
+            return None
+        
+        # 定长列按位宽估算，变长列（字符串等）按平均每个字段的字节数加8字节偏移量估算
+        num_cols = len(schema.names)
+        avg_field_bytes = file_size / max(num_rows * num_cols, 1)
+        row_bytes = 0.0
+        for field in schema:
+            try:
+                row_bytes += field.type.bit_width / 8
+            except ValueError:
+                row_bytes += avg_field_bytes + 8
+        
+        empty_df = schema.empty_table().to_pandas()
+        return {
+            'columns': list(schema.names),
+            'dtypes': empty_df.dtypes.to_dict(),
+            'sample_shape': (min(100, num_rows), num_cols),
+            'estimated_rows': num_rows,
+            'file_size_mb': file_size / (1024 * 1024),
+            'estimated_memory_mb': row_bytes * num_rows / (1024 * 1024)
+        }
+    
     def clear_cache(self) -> None:
         """清空缓存"""
         for file in os.listdir(self.cache_dir):
-            if file.endswith('.pkl'):
-                os.remove(os.path.join(self.cache_dir, file))
+            path = os.path.join(self.cache_dir, file)
+            if file.endswith(('.pkl', '.arrow')):
+                os.remove(path)
+            elif os.path.isdir(path) and len(file) == 32 and all(c in '0123456789abcdef' for c in file):
+                # 以缓存键命名的分块缓存目录
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.isdir(path) and file.endswith('.tmp'):
+                # 进程中途退出时遗留的临时分块目录
+                shutil.rmtree(path, ignore_errors=True)
         print("缓存已清空")
 
 
-def memory_efficient(func):
-    """内存优化装饰器"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        # 执行前垃圾回收
-        gc.collect()
-        
-        try:
-            result = func(*args, **kwargs)
-            return result
-        finally:
-            # 执行后垃圾回收
-            gc.collect()
-    
-    return wrapper
-
-
 class DataProcessor:
     """数据处理工具类"""
     
     @staticmethod
-    @memory_efficient
     def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         """数据预处理"""
-        df = df.copy()
+        df = _writable_copy(df)
         
         # 处理缺失值
         for col in df.columns:
@@ -300,43 +671,40 @@ class DataProcessor:
                 # 其他类型用'未知'填充
                 df[col] = df[col].fillna('未知')
         
-        # 处理异常值 - 只处理纯数值列
+        # 处理异常值 - 只处理纯数值列，一次计算所有列的分位数
         numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            # 跳过分类数据类型
-            if df[col].dtype.name == 'category':
-                continue
-                
+        if len(numeric_cols) > 0:
             # 替换无穷大值
-            df[col] = df[col].replace([np.inf, -np.inf], np.nan)
+            numeric = df[numeric_cols].replace([np.inf, -np.inf], np.nan)
             
             # 使用IQR方法处理异常值
             try:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
+                quartiles = numeric.quantile([0.25, 0.5, 0.75])
+                Q1, median, Q3 = quartiles.loc[0.25], quartiles.loc[0.5], quartiles.loc[0.75]
                 IQR = Q3 - Q1
                 
-                if IQR > 0 and not pd.isna(Q1) and not pd.isna(Q3):
-                    lower_bound = Q1 - 3 * IQR
-                    upper_bound = Q3 + 3 * IQR
-                    df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
+                # IQR为0或分位数缺失的列不裁剪（边界为NaN即不设边界）
+                valid = IQR > 0
+                lower_bound = (Q1 - 3 * IQR).where(valid)
+                upper_bound = (Q3 + 3 * IQR).where(valid)
+                numeric = numeric.clip(lower=lower_bound, upper=upper_bound, axis=1)
                 
                 # 再次填充可能产生的NaN
-                if df[col].isna().any():
-                    median_val = df[col].median()
-                    if pd.isna(median_val):
-                        median_val = 0
-                    df[col] = df[col].fillna(median_val)
+                numeric = numeric.fillna(median).fillna(0)
             except (TypeError, ValueError):
                 # 如果统计计算失败，只填充NaN为0
-                df[col] = df[col].fillna(0)
+                numeric = numeric.fillna(0)
+            df[numeric_cols] = numeric
         
         return df
     
     @staticmethod
-    @memory_efficient
     def aggregate_by_user(df: pd.DataFrame) -> pd.DataFrame:
         """按用户聚合数据"""
+        user_agg = DataProcessor._aggregate_by_user_polars(df)
+        if user_agg is not None:
+            return user_agg
+        
         user_agg = df.groupby('用户ID').agg({
             '性别': 'first',
             '昵称': 'first', 
@@ -359,35 +727,69 @@ class DataProcessor:
         return user_agg
     
     @staticmethod
-    @memory_efficient
+    def _aggregate_by_user_polars(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """用Polars多线程分组聚合，直接生成扁平列名，不可用或失败时返回None"""
+        if pl is None:
+            return None
+        
+        try:
+            first_cols = ['性别', '昵称', '注册省份', '注册城市', '微博数', '关注数', '粉丝数', '个人简介']
+            # 与pandas的first一致，取组内第一个非空值
+            exprs = [pl.col(col).drop_nulls().first().alias(f'{col}_first') for col in first_cols]
+            for col in ['转发数', '评论数', '点赞数']:
+                exprs += [pl.col(col).sum().alias(f'{col}_sum'),
+                          pl.col(col).mean().alias(f'{col}_mean'),
+                          pl.col(col).max().alias(f'{col}_max')]
+            exprs += [pl.col('发布时间').count().cast(pl.Int64).alias('发布时间_count'),
+                      pl.col('发布时间').min().alias('发布时间_min'),
+                      pl.col('发布时间').max().alias('发布时间_max')]
+            
+            # pandas分组会丢弃空用户ID并按用户ID排序
+            user_agg = (pl.from_pandas(df).lazy()
+                        .filter(pl.col('用户ID').is_not_null())
+                        .group_by('用户ID')
+                        .agg(exprs)
+                        .sort('用户ID')
+                        .collect())
+            return user_agg.to_pandas()
+        except Exception:
+            return None
+    
+    @staticmethod
     def extract_time_features(df: pd.DataFrame, time_col: str = '发布时间') -> pd.DataFrame:
         """提取时间特征"""
-        df = df.copy()
-        df[time_col] = pd.to_datetime(df[time_col])
-        
-        df['hour'] = df[time_col].dt.hour
-        df['day_of_week'] = df[time_col].dt.dayofweek
-        df['month'] = df[time_col].dt.month
-        df['is_weekend'] = df['day_of_week'].isin([5, 6])
+        times = df[time_col]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times, cache=True)
         
-        return df
+        # assign只新增或替换这几列，其余列与原数据共享内存
+        day_of_week = times.dt.dayofweek
+        return df.assign(**{
+            time_col: times,
+            'hour': times.dt.hour,
+            'day_of_week': day_of_week,
+            'month': times.dt.month,
+            'is_weekend': day_of_week.isin([5, 6])
+        })
     
     @staticmethod
-    @memory_efficient
     def calculate_user_activity_score(df: pd.DataFrame) -> pd.DataFrame:
         """计算用户活跃度得分"""
-        df = df.copy()
-        
-        # 标准化各项指标
-        from sklearn.preprocessing import StandardScaler
-        scaler = StandardScaler()
-        
         activity_features = ['微博数', '关注数', '粉丝数', '转发数', '评论数', '点赞数']
         available_features = [col for col in activity_features if col in df.columns]
         
         if available_features:
-            df[available_features] = scaler.fit_transform(df[available_features].fillna(0))
-            df['activity_score'] = df[available_features].mean(axis=1)
+            # 标准化各项指标（与StandardScaler相同：总体标准差，标准差为0的列只做中心化）
+            # 数据以float32原地计算，均值和标准差用float64累加保证精度
+            arr = df[available_features].to_numpy(dtype=np.float32, na_value=0)
+            mu = arr.mean(axis=0, dtype=np.float64)
+            sd = arr.std(axis=0, dtype=np.float64)
+            sd[sd == 0] = 1.0
+            np.subtract(arr, mu.astype(np.float32), out=arr)
+            np.divide(arr, sd.astype(np.float32), out=arr)
+            
+            scaled = {col: arr[:, i] for i, col in enumerate(available_features)}
+            return df.assign(**scaled, activity_score=arr.mean(axis=1))
         
         return df
 
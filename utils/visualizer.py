@@ -7,7 +7,8 @@ import streamlit as st
 from typing import Dict, List, Optional, Tuple, Any
 import folium
 from streamlit_folium import st_folium
-from wordcloud import WordCloud
+from wordcloud import WordCloud, STOPWORDS
+from wordcloud.tokenization import process_tokens
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
@@ -16,8 +17,20 @@ from collections import Counter
 import warnings
 import os
 import platform
+import re
 warnings.filterwarnings('ignore')
 
+# 与WordCloud默认分词规则相同
+WORD_PATTERN = re.compile(r"\w[\w']*")
+
+
+def _ensure_datetime(series: pd.Series, errors: str = 'raise') -> pd.Series:
+    """已是datetime类型的列直接返回，否则解析一次（重复的时间字符串只解析一次）"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors=errors, cache=True)
+
+
 class UserBehaviorVisualizer:
     """
     用户行为分析可视化工具类
@@ -138,8 +151,9 @@ class UserBehaviorVisualizer:
     
     def plot_geographic_heatmap(self, df: pd.DataFrame, 
                                lat_col: str = '纬度', 
-                               lon_col: str = '经度') -> folium.Map:
-        """地理位置热力图"""
+                               lon_col: str = '经度',
+                               bin_threshold: int = 100000) -> folium.Map:
+        """地理位置热力图，点数超过bin_threshold时先按网格聚合"""
         if lat_col not in df.columns or lon_col not in df.columns:
             st.error(f"缺少地理坐标列: {lat_col}, {lon_col}")
             return folium.Map()
@@ -164,7 +178,17 @@ class UserBehaviorVisualizer:
         
         # 添加热力图
         from folium.plugins import HeatMap
-        heat_data = [[row[lat_col], row[lon_col]] for idx, row in geo_df.iterrows()]
+        coords = geo_df[[lat_col, lon_col]].to_numpy(dtype=np.float64)
+        if len(coords) > bin_threshold:
+            # 点数过多时聚合到200x200网格，以网格中心为热力点、归一化点数为权重，大幅减小页面数据量
+            counts, lat_edges, lon_edges = np.histogram2d(coords[:, 0], coords[:, 1], bins=200)
+            lat_idx, lon_idx = np.nonzero(counts)
+            lat_centers = (lat_edges[:-1] + lat_edges[1:]) / 2
+            lon_centers = (lon_edges[:-1] + lon_edges[1:]) / 2
+            heat_data = np.column_stack([lat_centers[lat_idx], lon_centers[lon_idx],
+                                         counts[lat_idx, lon_idx] / counts.max()]).tolist()
+        else:
+            heat_data = coords.tolist()
         HeatMap(heat_data).add_to(m)
         
         # 添加聚类标记
@@ -175,10 +199,10 @@ class UserBehaviorVisualizer:
         sample_size = min(100, len(geo_df))
         sample_df = geo_df.sample(n=sample_size)
         
-        for idx, row in sample_df.iterrows():
+        for lat, lon in sample_df.itertuples(index=False, name=None):
             folium.Marker(
-                [row[lat_col], row[lon_col]],
-                popup=f"位置: ({row[lat_col]:.4f}, {row[lon_col]:.4f})"
+                [lat, lon],
+                popup=f"位置: ({lat:.4f}, {lon:.4f})"
             ).add_to(marker_cluster)
         
         return m
@@ -192,29 +216,36 @@ class UserBehaviorVisualizer:
             st.error(f"时间列 '{time_col}' 不存在")
             return go.Figure()
         
-        # 转换时间格式
-        df_time = df.copy()
-        df_time[time_col] = pd.to_datetime(df_time[time_col])
+        # 只取用到的列，时间列已是datetime类型时不再重复解析
+        columns = [time_col]
+        if value_col and value_col in df.columns and value_col != time_col:
+            columns.append(value_col)
+        df_time = df[columns].assign(**{time_col: _ensure_datetime(df[time_col])})
+        
+        # 按小时取整后一次哈希分组，无需按时间索引排序再重采样
+        buckets = df_time[time_col].dt.floor('h')
         
         if aggregation == 'count':
             # 按时间统计数量
-            time_series = df_time.set_index(time_col).resample('H').size()
+            time_series = df_time.groupby(buckets, sort=False).size()
             y_label = '发布数量'
             title = '用户发布时间分布'
         elif value_col and value_col in df.columns:
             # 按时间聚合指定列
-            if aggregation == 'sum':
-                time_series = df_time.set_index(time_col)[value_col].resample('H').sum()
-            elif aggregation == 'mean':
-                time_series = df_time.set_index(time_col)[value_col].resample('H').mean()
-            else:
-                time_series = df_time.set_index(time_col)[value_col].resample('H').count()
+            agg_func = aggregation if aggregation in ('sum', 'mean') else 'count'
+            time_series = df_time.groupby(buckets, sort=False)[value_col].agg(agg_func)
             y_label = f'{value_col} ({aggregation})'
             title = f'{value_col}时间趋势'
         else:
             st.error("请指定有效的数值列")
             return go.Figure()
         
+        # 与按小时重采样一致，补齐没有数据的小时（均值补空值，其余补0）
+        if len(time_series) > 0:
+            hours = pd.date_range(time_series.index.min(), time_series.index.max(), freq='h')
+            fill_value = np.nan if aggregation == 'mean' and value_col else 0
+            time_series = time_series.reindex(hours, fill_value=fill_value)
+        
         # 创建时间序列图
         fig = go.Figure()
         
@@ -243,20 +274,18 @@ class UserBehaviorVisualizer:
             st.error(f"时间列 '{time_col}' 不存在")
             return go.Figure()
         
-        # 提取小时信息
-        df_hour = df.copy()
-        df_hour[time_col] = pd.to_datetime(df_hour[time_col])
-        df_hour['hour'] = df_hour[time_col].dt.hour
+        # 提取小时信息（缺失时间不计入）
+        hours = _ensure_datetime(df[time_col]).dt.hour.dropna().to_numpy(dtype=np.int8)
         
-        # 统计每小时活跃度
-        hourly_activity = df_hour['hour'].value_counts().sort_index()
+        # 统计每小时活跃度：小时固定在0-23，直接按24个桶计数，无需哈希和排序
+        hourly_activity = np.bincount(hours, minlength=24)
         
         # 创建极坐标图
         fig = go.Figure()
         
         fig.add_trace(go.Scatterpolar(
-            r=hourly_activity.values,
-            theta=[f"{h}:00" for h in hourly_activity.index],
+            r=hourly_activity,
+            theta=[f"{h}:00" for h in range(24)],
             fill='toself',
             name='活跃度',
             line_color=self.color_palette[0]
@@ -285,8 +314,15 @@ class UserBehaviorVisualizer:
             st.error("需要至少2个数值列来计算相关性")
             return go.Figure()
         
-        # 计算相关性矩阵
-        corr_matrix = df[numeric_cols].corr()
+        # 计算相关性矩阵：无缺失值时用np.corrcoef一次矩阵运算完成，
+        # 有缺失值时仍用pandas按列对剔除缺失值，保证结果不变
+        values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(values).any():
+            corr_matrix = df[numeric_cols].corr()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = np.corrcoef(values, rowvar=False)
+            corr_matrix = pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
         
         # 创建热力图
         fig = go.Figure(data=go.Heatmap(
@@ -317,10 +353,14 @@ class UserBehaviorVisualizer:
             st.error("没有文本数据")
             return plt.figure()
         
-        # 合并所有文本
-        text = ' '.join([str(t) for t in text_data if pd.notna(t)])
+        # 逐条分词后交给WordCloud的process_tokens计数，不再拼接成大字符串；分词规则与WordCloud.generate默认一致
+        words = (word[:-2] if word.lower().endswith("'s") else word
+                 for t in text_data if pd.notna(t)
+                 for word in WORD_PATTERN.findall(str(t)))
+        word_freq, _ = process_tokens(word for word in words
+                                      if word.lower() not in STOPWORDS and not word.isdigit())
         
-        if not text.strip():
+        if not word_freq:
             st.error("文本数据为空")
             return plt.figure()
         
@@ -360,7 +400,7 @@ class UserBehaviorVisualizer:
                 })
                 st.info("🖥️ 本地环境：使用优化配置")
             
-            wordcloud = WordCloud(**wordcloud_config).generate(text)
+            wordcloud = WordCloud(**wordcloud_config).generate_from_frequencies(word_freq)
             
         except Exception as e:
             # 如果出现任何问题，使用最简配置
@@ -376,7 +416,7 @@ class UserBehaviorVisualizer:
                     'min_font_size': 10
                 }
                 
-                wordcloud = WordCloud(**simple_config).generate(text)
+                wordcloud = WordCloud(**simple_config).generate_from_frequencies(word_freq)
                 
             except Exception as e2:
                 st.error(f"词云生成失败: {str(e2)}")
@@ -411,10 +451,11 @@ class UserBehaviorVisualizer:
         size_col = available_cols[2] if len(available_cols) > 2 else None
         
         # 过滤异常值
-        df_clean = df[(df[x_col] >= 0) & (df[y_col] >= 0)].copy()
-        
+        # 布尔索引本身即生成新的DataFrame，只读使用无需再复制
+        valid = (df[x_col] >= 0) & (df[y_col] >= 0)
         if size_col:
-            df_clean = df_clean[df_clean[size_col] >= 0]
+            valid &= df[size_col] >= 0
+        df_clean = df[valid]
         
         # 创建散点图
         fig = px.scatter(
@@ -444,11 +485,9 @@ class UserBehaviorVisualizer:
             st.error("没有找到参与度相关指标")
             return go.Figure()
         
-        # 计算各级参与度的用户数
-        funnel_data = []
-        for col in available_cols:
-            count = (df[col] > 0).sum()
-            funnel_data.append((col, count))
+        # 计算各级参与度的用户数，所有指标列一次比较并按列求和
+        counts = df[available_cols].gt(0).sum()
+        funnel_data = list(zip(available_cols, counts.tolist()))
         
         # 添加总用户数
         funnel_data.insert(0, ('总用户数', len(df)))
@@ -494,48 +533,58 @@ def create_dashboard_metrics(df):
         }
     
     # 基础指标
-    metrics['total_users'] = len(df['用户ID'].unique()) if '用户ID' in df.columns else 0
+    metrics['total_users'] = df['用户ID'].nunique(dropna=False) if '用户ID' in df.columns else 0
     metrics['total_posts'] = len(df)
     
+    # 数值指标所需的统计量合并为一次agg计算，无穷大值视为缺失
+    stat_spec = {
+        '微博数': ['mean'],
+        '粉丝数': ['mean', 'max'],
+        '转发数': ['sum', 'mean'],
+        '评论数': ['sum', 'mean'],
+        '点赞数': ['sum', 'mean']
+    }
+    stat_spec = {col: funcs for col, funcs in stat_spec.items() if col in df.columns}
+    stats = {}
+    if stat_spec:
+        numeric = df[list(stat_spec)].replace([np.inf, -np.inf], np.nan)
+        table = numeric.agg(stat_spec)
+        for col, funcs in stat_spec.items():
+            for func in funcs:
+                value = table.at[func, col]
+                if pd.isna(value):
+                    # 整列缺失时记为0
+                    value = 0
+                elif func != 'mean' and pd.api.types.is_integer_dtype(numeric[col]):
+                    # agg结果表按列对齐后为浮点，整数列的合计和最大值还原为整数
+                    value = int(value)
+                stats[col, func] = value
+    
     # 活跃度指标
-    if '微博数' in df.columns:
-        weibo_data = df['微博数'].replace([np.inf, -np.inf], np.nan).dropna()
-        metrics['avg_posts_per_user'] = weibo_data.mean() if len(weibo_data) > 0 else 0
+    if '微博数' in stat_spec:
+        metrics['avg_posts_per_user'] = stats['微博数', 'mean']
     
-    if '粉丝数' in df.columns:
-        fans_data = df['粉丝数'].replace([np.inf, -np.inf], np.nan).dropna()
-        if len(fans_data) > 0:
-            metrics['avg_followers'] = fans_data.mean()
-            metrics['max_followers'] = fans_data.max()
-        else:
-            metrics['avg_followers'] = 0
-            metrics['max_followers'] = 0
+    if '粉丝数' in stat_spec:
+        metrics['avg_followers'] = stats['粉丝数', 'mean']
+        metrics['max_followers'] = stats['粉丝数', 'max']
     
     # 参与度指标
-    engagement_cols = ['转发数', '评论数', '点赞数']
-    for col in engagement_cols:
-        if col in df.columns:
-            col_data = df[col].replace([np.inf, -np.inf], np.nan).dropna()
-            if len(col_data) > 0:
-                metrics[f'total_{col}'] = col_data.sum()
-                metrics[f'avg_{col}'] = col_data.mean()
-            else:
-                metrics[f'total_{col}'] = 0
-                metrics[f'avg_{col}'] = 0
+    for col in ['转发数', '评论数', '点赞数']:
+        if col in stat_spec:
+            metrics[f'total_{col}'] = stats[col, 'sum']
+            metrics[f'avg_{col}'] = stats[col, 'mean']
     
     # 地理分布
     if '注册省份' in df.columns:
-        province_data = df['注册省份'].dropna()
-        metrics['provinces_count'] = province_data.nunique() if len(province_data) > 0 else 0
+        metrics['provinces_count'] = df['注册省份'].nunique()
     
     # 时间范围
     if '发布时间' in df.columns:
         try:
-            df_time = df.copy()
-            df_time['发布时间'] = pd.to_datetime(df_time['发布时间'], errors='coerce')
-            time_data = df_time['发布时间'].dropna()
+            time_data = _ensure_datetime(df['发布时间'], errors='coerce').dropna()
             if len(time_data) > 1:
-                metrics['time_range_days'] = (time_data.max() - time_data.min()).days
+                time_min, time_max = time_data.agg(['min', 'max'])
+                metrics['time_range_days'] = (time_max - time_min).days
             else:
                 metrics['time_range_days'] = 0
         except Exception: